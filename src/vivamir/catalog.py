@@ -0,0 +1,122 @@
+import bisect
+import dataclasses
+import difflib
+import json
+import re
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from vivamir.utility.paths import user_cache
+
+# Leading year and release of `version -short`, which patched releases extend as in `2022.2.2`.
+_VERSION = re.compile(r'\d+\.\d+')
+
+# Writes the version, every part, and every board as `board_part\tpart` to the given files.
+_DUMP = """
+set output [open [lindex $argv 0] w]
+puts $output [version -short]
+close $output
+
+set output [open [lindex $argv 1] w]
+puts $output [join [get_parts] "\\n"]
+close $output
+
+set output [open [lindex $argv 2] w]
+foreach board [get_boards] {
+    puts $output "[get_property NAME $board]\\t[get_property PART_NAME $board]"
+}
+close $output
+"""
+
+
+def _closest(candidates: list[str], value: str, count: int) -> list[str]:
+    """ Fuzzy matches among sorted candidates, looking only at the ones sharing the longest prefix first. """
+
+    for length in range(min(len(value), 6), 0, -1):
+        prefix = value[:length].lower()
+        start = bisect.bisect_left(candidates, prefix)
+        end = bisect.bisect_left(candidates, prefix + '\U0010ffff')
+        if end - start >= count and (matches := difflib.get_close_matches(
+                value.lower(), candidates[start:end], count, cutoff=0.5)):
+            return matches
+    return difflib.get_close_matches(value.lower(), candidates, count, cutoff=0.5)
+
+
+@dataclasses.dataclass(slots=True)
+class Catalog:
+    """ Parts and boards known to a Vivado version, dumped once and kept in the user cache. """
+
+    version: str
+    # Sorted and lower case, as Vivado matches them.
+    parts: list[str]
+    # Board part, as in `xilinx.com:zcu104:part0:1.1`, to the part on the board.
+    boards: dict[str, str]
+
+    @staticmethod
+    def path(version: str) -> Path:
+        return user_cache() / 'catalog' / f'{version}.json'
+
+    @classmethod
+    def load(cls, version: str) -> Optional['Catalog']:
+        try:
+            return cls(**json.loads(cls.path(version).read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    @classmethod
+    def dump(cls, vivado_executable: list[str]) -> 'Catalog':
+        """ Asks Vivado for its parts and boards, saving them under the version it reports. """
+
+        with tempfile.TemporaryDirectory() as folder:
+            folder = Path(folder)
+            (folder / 'dump.tcl').write_text(_DUMP)
+            outputs = [str(folder / name) for name in ('version', 'parts', 'boards')]
+            subprocess.run([
+                *vivado_executable, '-mode', 'batch', '-nojournal', '-nolog',
+                '-source', 'dump.tcl', '-tclargs', *outputs,
+            ], check=True, cwd=folder, stdout=subprocess.DEVNULL)
+
+            boards = dict(line.split('\t', 1) for line in (folder / 'boards').read_text().splitlines() if '\t' in line)
+            version = (folder / 'version').read_text().strip()
+            catalog = cls(
+                version=match[0] if (match := _VERSION.match(version)) else version,
+                parts=sorted(set(part.lower() for part in (folder / 'parts').read_text().split())),
+                boards=dict(sorted(boards.items())),
+            )
+
+        path = cls.path(catalog.version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(dataclasses.asdict(catalog), separators=(',', ':')))
+        temporary.replace(path)
+        return catalog
+
+    def has_part(self, part: str) -> bool:
+        index = bisect.bisect_left(self.parts, part.lower())
+        return index < len(self.parts) and self.parts[index] == part.lower()
+
+    def suggest_parts(self, part: str, count: int = 5) -> list[str]:
+        return _closest(self.parts, part, count)
+
+    def board_ids(self) -> list[str]:
+        """ Short board names, as in `zcu104`, used for `platform.board_id`. """
+
+        return sorted(set(board.split(':')[1] for board in self.boards if board.count(':') >= 2))
+
+    def has_board(self, board: str) -> bool:
+        return board in self.board_ids()
+
+    def suggest_boards(self, board: str, count: int = 5) -> list[str]:
+        return difflib.get_close_matches(board, self.board_ids(), count, cutoff=0.5)
+
+    def board_parts(self, board: Optional[str] = None, part: Optional[str] = None) -> list[str]:
+        """ Board parts of the given board, on the given part. """
+
+        return [board_part for board_part, board_part_part in self.boards.items()
+                if (board is None or board_part.count(':') >= 2 and board_part.split(':')[1] == board)
+                and (part is None or board_part_part.lower() == part.lower())]
+
+    def suggest_board_parts(self, board_part: str, count: int = 5) -> list[str]:
+        return difflib.get_close_matches(board_part, list(self.boards), count, cutoff=0.5)
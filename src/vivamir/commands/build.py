@@ -0,0 +1,36 @@
+import typer
+from rich import print
+
+from vivamir.commands.generate import command_generate
+from vivamir.ipcache import prune_ip_cache
+from vivamir.preflight import run_preflight
+from vivamir.utility.sampler import run_sampled
+from vivamir.vivamir import Vivamir
+
+
+def command_build(vivado_executable: list[str], non_project: bool = False, check: bool = True,
+                  sample_interval: float = 1.0):
+    """
+    Runs Vivado to synthesise and implement the design top up to the bitstream.
+
+    With --non-project sources are read in place, skipping project creation entirely.
+    With --no-check sources are not checked before starting Vivado.
+    """
+
+    vivamir = Vivamir.search()
+    if vivamir is None:
+        print('[bold red]No vivamir configuration found in the current working directory.')
+        return 1
+
+    if check and not run_preflight(vivamir):
+        raise typer.Exit(1)
+
+    print('INFO: [Vivamir] Regenerating scripts...')
+    command_generate()
+
+    run_sampled([
+        *vivado_executable, '-mode', 'batch', '-source', 'build.tcl' if non_project else 'bitstream.tcl'
+    ], vivamir.root / 'vivamir', sample_interval, 'build')
+    prune_ip_cache(vivamir)
+
+    print('[green]Done!')
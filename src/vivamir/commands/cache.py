@@ -0,0 +1,29 @@
+import typer
+from rich import print
+
+from vivamir.ipcache import IpCache
+from vivamir.settings import Settings
+from vivamir.utility.units import format_size
+
+
+def command_cache_info():
+    """ Prints how much the IP cache shared by every project holds. """
+
+    cache = IpCache.of()
+    entries = cache.entries()
+    print(f'IP cache: {cache.folder!s}')
+    print(f'{len(entries)} IPs, {format_size(sum(size for _, size, _ in entries))} of {format_size(cache.max_size)}, '
+          f'IPs used in the last {cache.grace / 3600:.0f} hours are kept.')
+    print(f'Set `ip_cache_size` and `ip_cache_grace` in {Settings.path()!s} to change them.')
+
+
+def command_cache_prune():
+    """ Evicts the least recently used IPs until the IP cache fits its size, sparing the recently used. """
+
+    removed = IpCache.of().evict()
+    print(f'Evicted {removed} IPs.')
+
+
+cache = typer.Typer(help='Manages the IP cache shared by every project.')
+cache.command(name='info')(command_cache_info)
+cache.command(name='prune')(command_cache_prune)
@@ -0,0 +1,36 @@
+import os
+import subprocess
+
+import dacite
+import typer
+from rich import print
+from rich.markup import escape
+
+from vivamir.preflight import run_preflight
+from vivamir.vivamir import Vivamir
+
+
+def command_check(jobs: int = os.cpu_count() or 1):
+    """
+    Checks the configuration, resolving every path and running every exec, then the sources.
+
+    Sources are syntax checked, up to --jobs at a time, includes must resolve and the top modules must exist.
+    Open, simulate and build run the same checks first, unless given --no-check.
+    """
+
+    root = Vivamir.search_root()
+    if root is None:
+        print('[bold red]No vivamir configuration found in the current working directory.')
+        raise typer.Exit(1)
+
+    try:
+        vivamir = Vivamir.load(root)
+        vivamir.check()
+    except (dacite.DaciteError, ValueError, OSError, subprocess.CalledProcessError) as error:
+        print(f'[bold red]ERROR: [Vivamir] {escape(str(root / "vivamir.toml"))}: {escape(str(error))}')
+        raise typer.Exit(1)
+
+    if not run_preflight(vivamir, jobs):
+        raise typer.Exit(1)
+
+    print('[green]Configuration and sources are valid.')
@@ -1,12 +1,47 @@
-import subprocess
+from pathlib import Path
 
 import typer
 from rich import print
+from rich.markup import escape
 
-from vivamir.vivamir import Vivamir
+from vivamir import files
+from vivamir.utility import git
+from vivamir.utility.sampler import run_sampled
+from vivamir.utility.transfer import transfer
+from vivamir.vivamir import Vivamir, FilesetKind
 
 
-def command_export(vivado_executable: list[str], yes: bool = False):
+def _transfers(vivamir: Vivamir, listed: Path) -> list[tuple[Path, Path]]:
+    """ Imported sources back to where they came from, except read-only ones, and new files listed by Vivado. """
+
+    pairs = []
+    if not vivamir.project.link:
+        skip = set(str(file) for file in files.rglob([
+            *files.folders(vivamir, FilesetKind.DES, read_only=True),
+            *files.folders(vivamir, FilesetKind.SIM, read_only=True),
+        ])) | files.ignored(vivamir)
+
+        for kind in FilesetKind:
+            imports = vivamir.root / 'vivamir' / 'project' / f'{vivamir.name}.srcs' / kind.vivado_name / 'imports'
+            # Sources are imported relative to the root, below a folder named after it.
+            base = next(iter(sorted(imports.iterdir())), None) if imports.is_dir() else None
+            if base is None:
+                continue
+            for file in files.rglob([base]):
+                destination = vivamir.root / file.relative_to(base)
+                if str(destination) not in skip:
+                    pairs.append((file, destination))
+
+    if listed.exists():
+        for line in listed.read_text().splitlines():
+            if '\t' in line:
+                source, destination = line.split('\t', 1)
+                pairs.append((Path(source), Path(destination)))
+
+    return pairs
+
+
+def command_export(vivado_executable: list[str], yes: bool = False, sample_interval: float = 1.0):
     """ Runs Vivado to export BDs and sources. """
 
     vivamir = Vivamir.search()
@@ -15,17 +50,30 @@ def command_export(vivado_executable: list[str], yes: bool = False):
         return 1
 
     if not yes:
-        print('[bold orange]This command will overwrite files!')
-        all_good = typer.confirm('Is the VCS all good?', default=False)
-        # TODO: git integration?
+        changes = git.dirty(vivamir.root)
+        if changes is None:
+            print('[bold orange]This command will overwrite files!')
+            all_good = typer.confirm('Is the VCS all good?', default=False)
+        elif changes:
+            print('[bold orange]This command will overwrite files, but there are uncommitted changes:')
+            for line in changes[:10]:
+                print(f'  {escape(line)}')
+            if len(changes) > 10:
+                print(f'  ... and {len(changes) - 10} more.')
+            all_good = typer.confirm('Overwrite anyway?', default=False)
+        else:
+            all_good = True
 
         if not all_good:
             print('Aborted.')
             return
 
-    subprocess.run([
-        *vivado_executable, '-mode', 'batch', '-source', 'export.tcl'
-    ], cwd=vivamir.root / 'vivamir', check=True)
+    listed = vivamir.cache / 'export.tsv'
+    listed.unlink(missing_ok=True)
+    run_sampled([
+        *vivado_executable, '-mode', 'batch', '-source', 'export.tcl', '-tclargs', str(listed)
+    ], vivamir.root / 'vivamir', sample_interval, 'export')
 
+    print(f'INFO: [Vivamir] Exported sources: {transfer(_transfers(vivamir, listed))!s}.')
     print('[green]Done!')
     print('  Check VCS for imports changes.')
@@ -1,6 +1,8 @@
 import textwrap
 from pathlib import Path
+from typing import Optional
 
+from vivamir.manifest import Delta, PENDING
 from vivamir.vivamir import Vivamir, FilesetKind
 
 
@@ -39,12 +41,19 @@ def _generate_commons(vivamir: Vivamir) -> str:
         '\n            '.join(f'{file} \\'
                               for file in sorted(vivamir.ignore.list))
 
+    # Counted when the script runs, it may not be on the machine it was generated on.
+    jobs = f'set jobs {vivamir.project.jobs}' if vivamir.project.jobs else '\n        '.join([
+        'if { [catch {exec nproc} jobs] } {',
+        '    set jobs [expr { [info exists ::env(NUMBER_OF_PROCESSORS)] ? $::env(NUMBER_OF_PROCESSORS) : 1 }]',
+        '}',
+    ])
+
     return f"""
         ### Generated by vivamir.
         # Do not edit manually.
         #
         # Common procedures and variables.
-        # Version 2.0.0
+        # Version 2.6.1
         
         ## Check if script is running in correct Vivado version.
         set supported_vivado_version {{{vivamir.vivado.version}}}
@@ -120,6 +129,8 @@ def _generate_commons(vivamir: Vivamir) -> str:
 
         ### From Vivamir
         set project_name {vivamir.name}
+        set link_sources {int(vivamir.project.link)}
+        {jobs}
         
         set block_designs [list \\
             {block_designs}
@@ -142,6 +153,172 @@ def _generate_commons(vivamir: Vivamir) -> str:
         set ignores [list \\
             {ignores}
         ]
+
+        ## Expand
+        proc vivamir_expand {{dirlist {{extensions {{.v .vh .sv .svh .vhdl}}}}}} {{
+            set ignore_files_dict {{}}
+            foreach ignore $::ignores {{
+                foreach file [glob -nocomplain -directory $::root -- $ignore] {{
+                    dict set ignore_files_dict $file ""
+                }}
+            }}
+
+            set valid_extensions {{}}
+            foreach extension $extensions {{
+                dict set valid_extensions $extension ""
+            }}
+
+            set files {{}}
+            foreach file [rglob $dirlist {{*.*}}] {{
+                if {{[dict exists $valid_extensions [file extension $file]] && ![dict exists $ignore_files_dict $file]}} {{
+                    lappend files $file
+                }}
+            }}
+            return $files
+        }}
+
+        ## Includes
+        proc vivamir_set_includes {{}} {{
+            set includes_imported {{}}
+            foreach include $::includes {{
+                if {{$::link_sources}} {{
+                    lappend includes_imported $include
+                    continue
+                }}
+                set include_rel [string replace $include 0 [string len $::root]]
+                lappend includes_imported $::root/vivamir/project/$::project_name.srcs/sources_1/imports/$::root_name/$include_rel
+            }}
+            set_property include_dirs $includes_imported [get_filesets sources_1]
+            # TODO: Includes work only as globals?
+            foreach include $includes_imported {{
+                catch {{
+                    set_property is_global_include true [get_files -quiet $include/*]
+                }}
+            }}
+        }}
+
+        ## IP cache
+        proc vivamir_ip_cache {{}} {{
+            if {{[info exists ::env(XDG_CACHE_HOME)] && $::env(XDG_CACHE_HOME) ne ""}} {{
+                set cache $::env(XDG_CACHE_HOME)
+            }} else {{
+                set cache [file join $::env(HOME) .cache]
+            }}
+            set cache [file join $cache vivamir ip [version -short] [get_property PART [current_project]]]
+            file mkdir $cache
+            set_property ip_output_repo $cache [current_project]
+            set_property ip_cache_permissions {{read write}} [current_project]
+        }}
+
+        ## Block Designs
+        proc vivamir_add_bd {{bd}} {{
+            # Source Tcl, block designs expect to run at global level
+            uplevel #0 [list source -notrace $bd]
+            set design_name $::design_name
+
+            # Generate wrapper
+            make_wrapper -fileset sources_1 -top [get_files ${{design_name}}.bd]
+
+            # Add wrapper
+            add_files -fileset sources_1 "$::root/vivamir/project/${{::project_name}}.gen/sources_1/bd/${{design_name}}/hdl/${{design_name}}_wrapper.v"
+            return $design_name
+        }}
+
+        proc vivamir_seconds {{milliseconds}} {{
+            return [format %.1f [expr {{$milliseconds / 1000.0}}]]
+        }}
+
+        # Generates the output products of every block design, then runs all their out-of-context IPs at once.
+        proc vivamir_generate_bds {{names jobs}} {{
+            if {{[llength $names] == 0}} {{
+                return
+            }}
+
+            set runs [dict create]
+            set generated [dict create]
+            foreach name $names {{
+                set start [clock milliseconds]
+                set bd_file [get_files ${{name}}.bd]
+                generate_target all $bd_file
+                set before [get_runs -quiet]
+                create_ip_run $bd_file
+                dict set runs $name [lmap run [get_runs -quiet] {{ if {{$run in $before}} continue; set run }}]
+                dict set generated $name [expr {{[clock milliseconds] - $start}}]
+            }}
+
+            # IPs found in the IP cache get no run.
+            set all [concat {{*}}[dict values $runs]]
+            set start [clock milliseconds]
+            if {{[llength $all] > 0}} {{
+                launch_runs $all -jobs $jobs
+                foreach run $all {{
+                    wait_on_run $run
+                }}
+            }}
+            set elapsed [expr {{[clock milliseconds] - $start}}]
+
+            foreach name $names {{
+                set longest 0
+                foreach run [dict get $runs $name] {{
+                    if {{[scan [get_property -quiet STATS.ELAPSED $run] %d:%d:%d hours minutes seconds] == 3}} {{
+                        set longest [expr {{max($longest, (($hours * 60 + $minutes) * 60 + $seconds) * 1000)}}]
+                    }}
+                }}
+                puts "INFO: \\[Vivamir\\] Block design $name: output products in [vivamir_seconds [dict get $generated $name]]s,\\
+                    [llength [dict get $runs $name]] out-of-context runs, the longest in [vivamir_seconds $longest]s."
+            }}
+            puts "INFO: \\[Vivamir\\] [llength $all] out-of-context runs of [llength $names] block designs\\
+                finished in [vivamir_seconds $elapsed]s, $jobs at a time."
+        }}
+
+        proc vivamir_remove_bd {{name}} {{
+            remove_files -quiet [get_files -quiet ${{name}}_wrapper.v]
+            remove_files -quiet [get_files -quiet ${{name}}.bd]
+            file delete -force $::root/vivamir/project/$::project_name.srcs/sources_1/bd/$name
+            file delete -force $::root/vivamir/project/$::project_name.gen/sources_1/bd/$name
+        }}
+
+        ## Import
+        proc vivamir_import_fileset {{kind read_only_filesets}} {{
+            if {{!$::link_sources}} {{
+                import_files -relative_to $::root -fileset $kind
+                return
+            }}
+
+            # Linked sources are edited in place, read-only ones are still imported.
+            set files [vivamir_expand $read_only_filesets]
+            if {{[llength $files] > 0}} {{
+                import_files -relative_to $::root -fileset $kind $files
+            }}
+        }}
+
+        ## Update
+        proc vivamir_project_files {{kind file}} {{
+            return [get_files -quiet -of_objects [get_filesets $kind] -filter "NAME == \\"$file\\" || IMPORTED_FROM == \\"$file\\""]
+        }}
+
+        proc vivamir_update_fileset {{kind removed added imported}} {{
+            foreach file $removed {{
+                set objects [vivamir_project_files $kind $file]
+                if {{[llength $objects] > 0}} {{
+                    remove_files -fileset $kind $objects
+                }}
+            }}
+            if {{[llength $added] > 0}} {{
+                add_files -fileset $kind -norecurse $added
+            }}
+            if {{[llength $imported] > 0}} {{
+                import_files -force -relative_to $::root -fileset $kind $imported
+            }}
+        }}
+
+        ## Manifest
+        proc vivamir_commit_manifest {{}} {{
+            set pending $::root/vivamir/vivamir.manifest.json
+            if {{[file exists $pending]}} {{
+                file rename -force $pending $::root/vivamir/project/vivamir.manifest.json
+            }}
+        }}
                     
         ## Export
         proc vivamir_export_bds {{}} {{
@@ -169,7 +346,26 @@ def _generate_commons(vivamir: Vivamir) -> str:
             }}
         }}
         
-        proc vivamir_export_fileset {{kind {{new_file_dst $::root}}}} {{
+        proc vivamir_export_fileset {{kind {{transfers {{}}}}}} {{
+            # Given a channel, new files are only listed on it and vivamir copies everything itself.
+            if {{!$::link_sources && $transfers eq ""}} {{
+                vivamir_export_imports $kind
+            }}
+        
+            set new_file_dst {{}}
+            dict set new_file_dst sources_1 $::root/{vivamir.first_fileset(FilesetKind.DES).path}
+            dict set new_file_dst sim_1 $::root/{vivamir.first_fileset(FilesetKind.SIM).path}
+        
+            foreach file [get_files -quiet $::root/vivamir/project/$::project_name.srcs/$kind/new/*] {{
+                if {{$transfers ne ""}} {{
+                    puts $transfers "$file\t[dict get $new_file_dst $kind]/[file tail $file]"
+                }} else {{
+                    file copy $file [dict get $new_file_dst $kind]
+                }}
+            }}
+        }}
+
+        proc vivamir_export_imports {{kind}} {{
             set ignore_files_dict {{}}
             foreach ignore $::ignores {{
                 foreach file [glob -nocomplain -directory $::root -- $ignore] {{
@@ -191,21 +387,17 @@ def _generate_commons(vivamir: Vivamir) -> str:
         
             set imports [lindex [glob $::root/vivamir/project/$::project_name.srcs/$kind/imports/*] 0]
             copytree $imports $::root $skip
-        
-            set new_file_dst {{}}
-            dict set new_file_dst sources_1 $::root/{vivamir.first_fileset(FilesetKind.DES).path}
-            dict set new_file_dst sim_1 $::root/{vivamir.first_fileset(FilesetKind.SIM).path}
-        
-            foreach file [get_files -quiet $::root/vivamir/project/$::project_name.srcs/$kind/new/*] {{
-                file copy $file [dict get $new_file_dst $kind]
-            }}
         }}
     """
 
 
-def _generate_project(vivamir: Vivamir) -> str:
-    # TODO: configurable extensions
+def _ip_repo_paths(vivamir: Vivamir) -> str:
+    if vivamir.ips.user_ip_repo_path.exists_in_project(vivamir):
+        return f'$::root/{vivamir.ips.user_ip_repo_path}'
+    return '""'
+
 
+def _generate_settings(vivamir: Vivamir) -> str:
     # TODO: should be done at "runtime".
     setup_waveform = ''
     if waveform := next(
@@ -216,116 +408,140 @@ def _generate_project(vivamir: Vivamir) -> str:
         # TODO: this does not update `current_wave_config`
         setup_waveform = f'set_property -name xsim.view -value "$::root/{waveform!s}" -object [get_filesets sim_1]'
 
-    # TODO: configure caches.
-
     user_settings = \
         '\n        '.join(prop.as_tcl()
                           for prop in vivamir.vivado.properties)
 
+    return f"""
+        ### Top modules
+        set_property top_lib xil_defaultlib [get_filesets sources_1]
+        set_property top {{{vivamir.design_top}}} [get_filesets sources_1]
+        
+        set_property top_lib xil_defaultlib [get_filesets sim_1]
+        set_property top {{{vivamir.simulation_top}}} [get_filesets sim_1]
+        {setup_waveform}
+                            
+        ### User Settings
+        {user_settings}
+    """.strip()
+
+
+def _generate_project(vivamir: Vivamir) -> str:
+    # TODO: configurable extensions
+
+    ip_cache = 'vivamir_ip_cache' if vivamir.project.ip_cache else '# Disabled.'
+
     return f"""
         ### Generated by vivamir.
         # Do not edit manually.
         #
         # Creates the project.
-        # Version 2.1.0
+        # Version 2.6.0
         
         ### Commons
         source commons.tcl
 
         ## Expand
-        set ignore_files_dict {{}}
-        foreach ignore $::ignores {{
-            foreach file [glob -nocomplain -directory $::root -- $ignore] {{
-                dict set ignore_files_dict $file ""
-            }}
-        }}
-        
-        set valid_extensions {{}}
-        dict set valid_extensions .v ""
-        dict set valid_extensions .vh ""
-        dict set valid_extensions .sv ""
-        dict set valid_extensions .svh ""
-        dict set valid_extensions .vhdl ""
-        
-        set des_files {{}}
-        foreach file [rglob $des_filesets {{*.*}}] {{
-            if {{[dict exists $valid_extensions [file extension $file]] && ![dict exists $ignore_files_dict $file]}} {{
-                lappend des_files $file
-            }}
-        }}
-        
-        set sim_files {{}}
-        foreach file [rglob $sim_filesets {{*.*}}] {{
-            if {{[dict exists $valid_extensions [file extension $file]] && ![dict exists $ignore_files_dict $file]}} {{
-                lappend sim_files $file
-            }}
-        }}
-        
-        set inc_files {{}}
-        foreach file [rglob $includes {{*.*}}] {{
-            if {{[dict exists $valid_extensions [file extension $file]] && ![dict exists $ignore_files_dict $file]}} {{
-                lappend inc_files $file
-            }}
-        }}
+        set des_files [vivamir_expand $des_filesets]
+        set sim_files [vivamir_expand $sim_filesets]
+        set inc_files [vivamir_expand $includes]
         
         ### Force create project
+        file delete -force $::root/vivamir/project/vivamir.manifest.json
         create_project $project_name $::root/vivamir/project -part {vivamir.vivado.part} -force
         set_property -name "board_part" -value {vivamir.vivado.board_long} -objects [current_project]
         set_property -name "platform.board_id" -value {vivamir.vivado.board} -objects [current_project]
 
+        ### IP cache
+        {ip_cache}
+
         ### Design files
         add_files -fileset sources_1 -norecurse $des_files
         add_files -fileset sources_1 -norecurse $inc_files
-        import_files -relative_to $root -fileset sources_1
+        vivamir_import_fileset sources_1 $des_filesets_read_only
         
         ### Includes
-        set includes_imported {{}}
-        foreach include $includes {{
-            set include_rel [string replace $include 0 [string len $::root]]
-            lappend includes_imported $::root/vivamir/project/$project_name.srcs/sources_1/imports/$root_name/$include_rel
-        }}
-        set_property include_dirs $includes_imported [get_filesets sources_1]
-        # TODO: Includes work only as globals?
-        foreach include $includes_imported {{
-            catch {{
-                set_property is_global_include true [get_files -quiet $include/*]
-            }}
-        }}
+        vivamir_set_includes
         
         ### Simulation files
         add_files -fileset sim_1 -norecurse $sim_files
-        import_files -relative_to $root -fileset sim_1
+        vivamir_import_fileset sim_1 $sim_filesets_read_only
         
         ### Load user IPs
-        set_property ip_repo_paths {f'$::root/{vivamir.ips.user_ip_repo_path}' if vivamir.ips.user_ip_repo_path.exists_in_project(vivamir) else '""'} [current_project]
+        set_property ip_repo_paths {_ip_repo_paths(vivamir)} [current_project]
         update_ip_catalog
 
         ### Block Designs
-        foreach bd $block_designs {{
-            # Source Tcl
-            source -notrace $bd
+        # Sourced one after another, their output products are generated in parallel.
+        set block_design_names [lmap bd $block_designs {{ vivamir_add_bd $bd }}]
+        vivamir_generate_bds $block_design_names $::jobs
+        
+        {_generate_settings(vivamir)}
 
-            # Generate wrapper
-            make_wrapper -fileset sources_1 -top [get_files ${{design_name}}.bd] 
+        ### Update
+        update_compile_order -fileset sources_1
+        update_compile_order -fileset sim_1
 
-            # Add wrapper
-            add_files -fileset sources_1 "$::root/vivamir/project/${{project_name}}.gen/sources_1/bd/${{design_name}}/hdl/${{design_name}}_wrapper.v"                
-        }}
-        
-        ### Top modules
-        set_property top_lib xil_defaultlib [get_filesets sources_1]
-        set_property top {{{vivamir.design_top}}} [get_filesets sources_1]
-        
-        set_property top_lib xil_defaultlib [get_filesets sim_1]
-        set_property top {{{vivamir.simulation_top}}} [get_filesets sim_1]
-        {setup_waveform}
-                            
-        ### User Settings
-        {user_settings}
+        ### Manifest
+        vivamir_commit_manifest
+    """
+
+
+def _generate_update(vivamir: Vivamir, delta: Delta) -> str:
+    def _tcl_list(paths: list[str]) -> str:
+        return '[list ' + ' '.join(f'{{{path}}}' for path in paths) + ']'
+
+    files = \
+        '\n        '.join(f'vivamir_update_fileset {kind} '
+                          f'{_tcl_list(delta.removed[kind])} {_tcl_list(delta.added[kind])} '
+                          f'{_tcl_list(delta.imported[kind])}'
+                          for kind in delta.kinds())
+    includes = 'vivamir_set_includes' if delta.includes else '# Unchanged.'
+    ip_catalog = \
+        (f'set_property ip_repo_paths {_ip_repo_paths(vivamir)} [current_project]\n'
+         f'        update_ip_catalog -rebuild') if delta.ip_catalog else '# Unchanged.'
+    block_designs = \
+        '\n        '.join([*(f'vivamir_remove_bd {{{Path(bd).stem}}}' for bd in delta.block_designs_removed),
+                           *(f'lappend block_design_names [vivamir_add_bd {{{bd}}}]'
+                             for bd in delta.block_designs_added)]) or '# Unchanged.'
+    if delta.block_designs_added:
+        block_designs += '\n        vivamir_generate_bds $block_design_names $::jobs'
+    settings = _generate_settings(vivamir) if delta.settings else '# Unchanged.'
+
+    return f"""
+        ### Generated by vivamir.
+        # Do not edit manually.
+        #
+        # Applies changes to the existing project instead of creating it again.
+        # Version 1.1.0
+
+        ### Commons
+        source commons.tcl
+
+        ### Open project
+        open_project $::root/vivamir/project/$::project_name.xpr
+
+        ### Files
+        {files}
+
+        ### Includes
+        {includes}
+
+        ### Load user IPs
+        {ip_catalog}
+
+        ### Block Designs
+        {block_designs}
+
+        ### Settings
+        {settings}
 
         ### Update
         update_compile_order -fileset sources_1
         update_compile_order -fileset sim_1
+
+        ### Manifest
+        vivamir_commit_manifest
     """
 
 
@@ -335,7 +551,7 @@ def _generate_export(_vivamir: Vivamir) -> str:
         # Do not edit manually.
         #
         # Exports BDs and sources.
-        # Version 2.0.0
+        # Version 2.1.0
         
         ### Commons
         source commons.tcl
@@ -347,8 +563,16 @@ def _generate_export(_vivamir: Vivamir) -> str:
         vivamir_export_bds
         
         ### Export sources
-        vivamir_export_fileset sources_1
-        vivamir_export_fileset sim_1
+        # With `-tclargs <file>` new files are listed there, for vivamir to copy them with the imports.
+        set transfers {{}}
+        if {{[info exists argv] && [llength $argv] > 0}} {{
+            set transfers [open [lindex $argv 0] w]
+        }}
+        vivamir_export_fileset sources_1 $transfers
+        vivamir_export_fileset sim_1 $transfers
+        if {{$transfers ne ""}} {{
+            close $transfers
+        }}
     """
 
 
@@ -357,11 +581,15 @@ def _generate_open(_vivamir: Vivamir) -> str:
         ### Generated by vivamir.
         # Do not edit manually.
         #
-        # Starts the GUI after setting up a fresh project.
-        # Version 2.0.0
-        
-        ### Create the project.
-        source project.tcl
+        # Starts the GUI after setting up the project.
+        # Version 2.2.0
+        
+        ### Create the project, or update the existing one.
+        if {{[file exists update.tcl]}} {{
+            source update.tcl
+        }} else {{
+            source project.tcl
+        }}
         
         ### Start GUI
         ## Export at exit (disabled due to issues with stdin on `vivamir open`)
@@ -374,8 +602,9 @@ def _generate_open(_vivamir: Vivamir) -> str:
         #     }}
         # }}
         
-        ## Continue logging to terminal
-        set pid [exec tail -n0 -f $::root/vivamir/vivado.log &]
+        ## Continue logging to terminal, vivamir follows the log from here on
+        puts "INFO: \\[Vivamir\\] Following vivado.log."
+        flush stdout
         
         ## Wait for successful start (useful on macOS)
         while 1 {{
@@ -406,19 +635,18 @@ def _generate_simulate(_vivamir: Vivamir) -> str:
 
 
 def _generate_bitstream(_vivamir: Vivamir) -> str:
-    # TODO: Configurable job count.
     return f"""
         ### Generated by vivamir.
         # Do not edit manually.
         #
         # Runs synthesis and implementation, creating two checkpoints.
-        # Version 1.0.0
+        # Version 1.1.0
 
         ### Create the project.
         source project.tcl
         
         ### Synthesis
-        launch_runs synth_1 -jobs 32
+        launch_runs synth_1 -jobs $::jobs
         wait_on_run synth_1
     
         # Save
@@ -427,7 +655,7 @@ def _generate_bitstream(_vivamir: Vivamir) -> str:
         # close_run synth_1
         
         ### Implementation (to Bitstream)
-        launch_runs impl_1 -jobs 32 -to_step write_bitstream
+        launch_runs impl_1 -jobs $::jobs -to_step write_bitstream
         wait_on_run impl_1
         
         # open_run impl_1
@@ -436,6 +664,97 @@ def _generate_bitstream(_vivamir: Vivamir) -> str:
     """
 
 
+def _generate_build(vivamir: Vivamir) -> str:
+    return f"""
+        ### Generated by vivamir.
+        # Do not edit manually.
+        #
+        # Runs synthesis and implementation in non-project mode.
+        # Sources are read in place, checkpoints and reports are written after each stage.
+        # Version 1.1.0
+
+        ### Commons
+        source commons.tcl
+
+        set build_dir $::root/vivamir/build
+        file mkdir $build_dir
+        cd $build_dir
+
+        ### In-memory project, block designs still require one.
+        create_project -in_memory -part {vivamir.vivado.part}
+        set_property -name "board_part" -value {vivamir.vivado.board_long} -objects [current_project]
+        set_property -name "platform.board_id" -value {vivamir.vivado.board} -objects [current_project]
+        set_property ip_repo_paths {_ip_repo_paths(vivamir)} [current_project]
+        update_ip_catalog
+
+        ### Design files
+        foreach file [vivamir_expand $des_filesets {{.v .sv .vhdl}}] {{
+            switch -- [file extension $file] {{
+                .v {{ read_verilog $file }}
+                .sv {{ read_verilog -sv $file }}
+                .vhdl {{ read_vhdl $file }}
+            }}
+        }}
+
+        ### Includes
+        # Headers in the design folders are found by name in project mode, here their folders are searched.
+        set include_dirs $includes
+        foreach header [vivamir_expand $des_filesets {{.vh .svh}}] {{
+            if {{[file dirname $header] ni $include_dirs}} {{
+                lappend include_dirs [file dirname $header]
+            }}
+        }}
+
+        ### Constraints
+        foreach file [vivamir_expand $des_filesets {{.xdc}}] {{
+            read_xdc $file
+        }}
+
+        ### Block Designs
+        foreach bd $block_designs {{
+            # Source Tcl
+            source -notrace $bd
+            set bd_file [get_files ${{design_name}}.bd]
+
+            # Synthesise with the top module instead of out-of-context
+            set_property synth_checkpoint_mode None $bd_file
+            generate_target all $bd_file
+
+            # Read wrapper
+            read_verilog [make_wrapper -files $bd_file -top]
+        }}
+
+        ### Synthesis
+        synth_design -top {{{vivamir.design_top}}} -part {vivamir.vivado.part} -include_dirs $include_dirs
+        write_checkpoint -force $build_dir/post_synth.dcp
+        report_timing_summary -file $build_dir/post_synth_timing_summary.rpt
+        report_utilization -file $build_dir/post_synth_utilization.rpt
+
+        ### Optimisation
+        opt_design
+        write_checkpoint -force $build_dir/post_opt.dcp
+        report_drc -file $build_dir/post_opt_drc.rpt
+
+        ### Placement
+        place_design
+        write_checkpoint -force $build_dir/post_place.dcp
+        report_timing_summary -file $build_dir/post_place_timing_summary.rpt
+        report_utilization -file $build_dir/post_place_utilization.rpt
+
+        ### Routing
+        route_design
+        write_checkpoint -force $build_dir/post_route.dcp
+        report_route_status -file $build_dir/post_route_status.rpt
+        report_timing_summary -file $build_dir/post_route_timing_summary.rpt
+        report_utilization -file $build_dir/post_route_utilization.rpt
+        report_power -file $build_dir/post_route_power.rpt
+        report_drc -file $build_dir/post_route_drc.rpt
+
+        ### Bitstream
+        write_bitstream -force $build_dir/$::project_name.bit
+    """
+
+
 def command_generate():
     """ Generates Tcl scripts based on the current configuration. """
 
@@ -450,8 +769,23 @@ def command_generate():
         ('export', _generate_export),
         ('open', _generate_open),
         ('simulate', _generate_simulate),
-        # ('bitstream', _generate_bitstream),
+        ('bitstream', _generate_bitstream),
+        ('build', _generate_build),
     ]:
         (vivamir.root / 'vivamir' / f'{filename}.tcl').write_text(
             textwrap.dedent(generate(vivamir)).strip() + '\n'
         )
+
+    (vivamir.root / 'vivamir' / 'update.tcl').unlink(missing_ok=True)
+    # Left by an interrupted open, the project never got its changes.
+    (vivamir.root / PENDING).unlink(missing_ok=True)
+
+
+def generate_update(vivamir: Vivamir, delta: Optional[Delta]):
+    """ Writes the script updating the existing project, or removes it when a full rebuild is needed. """
+
+    script = vivamir.root / 'vivamir' / 'update.tcl'
+    if delta is None:
+        script.unlink(missing_ok=True)
+    else:
+        script.write_text(textwrap.dedent(_generate_update(vivamir, delta)).strip() + '\n')
@@ -1,10 +1,15 @@
+import functools
+import os
 import re
 import shutil
+import subprocess
 from pathlib import Path
 from typing import Optional
 
+import typer
 from rich import print
 
+from vivamir.catalog import Catalog
 from vivamir.vivamir import Vivamir
 from vivamir.utility.paths import DEFAULT
 from vivamir.utility.version import SemanticVersion
@@ -29,23 +34,95 @@ def _validate_version(version: str) -> Optional[str]:
     return version
 
 
-def _validate_part(part: str) -> Optional[str]:
-    print('[yellow]No validation has been implemented yet.')
+def _suggest(suggestions: list[str]):
+    if suggestions:
+        print(f'Did you mean: {", ".join(suggestions)}?')
+
+
+def _validate_part(catalog: Optional[Catalog], part: str) -> Optional[str]:
+    if catalog is None:
+        return part
+
+    if not catalog.has_part(part):
+        print(f'[bold red]Part {part} is not known to Vivado {catalog.version}.')
+        _suggest(catalog.suggest_parts(part))
+        return None
+
     return part
 
 
-def _validate_board(board: str) -> Optional[str]:
-    print('[yellow]No validation has been implemented yet.')
+def _validate_board(catalog: Optional[Catalog], board: str) -> Optional[str]:
+    if catalog is None:
+        return board
+
+    if not catalog.has_board(board):
+        print(f'[bold red]Board {board} is not known to Vivado {catalog.version}.')
+        _suggest(catalog.suggest_boards(board))
+        return None
+
     return board
 
 
-def _validate_board_long(board_long: str) -> Optional[str]:
-    print('[yellow]No validation has been implemented yet.')
+def _validate_board_long(catalog: Optional[Catalog], board: str, part: str, board_long: str) -> Optional[str]:
+    if catalog is None:
+        return board_long
+
+    if board_long not in catalog.boards:
+        print(f'[bold red]Board part {board_long} is not known to Vivado {catalog.version}.')
+        _suggest(catalog.board_parts(board) or catalog.suggest_board_parts(board_long))
+        return None
+
+    if board_long not in catalog.board_parts(board, part):
+        print(f'[bold red]Board part {board_long} does not match board {board} with part {part}.')
+        _suggest(catalog.board_parts(board, part))
+        return None
+
     return board_long
 
 
-def command_init():
-    """ Initialise a new Vivamir project. """
+def _vivado(vivado_executable: Optional[list[str]]) -> Optional[list[str]]:
+    """ The given Vivado, else the one of the sourced settings64.sh, else the one in the PATH. """
+
+    if vivado_executable:
+        return vivado_executable
+
+    if (installation := os.environ.get('XILINX_VIVADO')) and (executable := Path(installation) / 'bin/vivado').exists():
+        return [str(executable)]
+
+    return [executable] if (executable := shutil.which('vivado')) is not None else None
+
+
+def _catalog(version: str, vivado_executable: Optional[list[str]]) -> Optional[Catalog]:
+    """ Parts and boards of the Vivado version, dumped from Vivado the first time. """
+
+    if (catalog := Catalog.load(version)) is not None:
+        return catalog
+
+    if (vivado_executable := _vivado(vivado_executable)) is None:
+        print(f'[yellow]No catalog of parts and boards for Vivado {version}, they will not be validated.')
+        return None
+
+    print('INFO: [Vivamir] Reading parts and boards from Vivado, only done once per version...')
+    try:
+        catalog = Catalog.dump(vivado_executable)
+    except (OSError, subprocess.CalledProcessError):
+        print('[yellow]Could not read parts and boards from Vivado, they will not be validated.')
+        return None
+
+    if catalog.version != version:
+        print(f'[yellow]Vivado found is {catalog.version}, parts and boards will not be validated.')
+        return None
+
+    return catalog
+
+
+def command_init(vivado_executable: Optional[list[str]] = typer.Argument(None)):
+    """
+    Initialise a new Vivamir project.
+
+    Parts and boards are checked against the given Vivado, else the one of settings64.sh or the PATH.
+    Values it does not know can still be used after confirming them.
+    """
 
     if Vivamir.search() is not None:
         print('[bold red]Project found, aborting.')
@@ -55,9 +132,14 @@ def command_init():
 
     name = prompt_until_valid('Base library name', _validate_name, project.name)
     version = prompt_until_valid('Vivado version', _validate_version, '2022.2')
-    part = prompt_until_valid('Vivado part', _validate_part)
-    board = prompt_until_valid('Vivado board', _validate_board)
-    board_long = prompt_until_valid('Vivado board long', _validate_board_long)
+    catalog = _catalog(version, vivado_executable)
+    # Catalogs can lag behind installed board files, so they are only advice.
+    part = prompt_until_valid('Vivado part', functools.partial(_validate_part, catalog), overridable=True)
+    board = prompt_until_valid('Vivado board', functools.partial(_validate_board, catalog), overridable=True)
+    board_long = prompt_until_valid(
+        'Vivado board long', functools.partial(_validate_board_long, catalog, board, part),
+        next(iter(catalog.board_parts(board, part)), None) if catalog is not None else None, overridable=True,
+    )
 
     current_version = SemanticVersion.project()
     config = ((DEFAULT / 'vivamir.pyl')
@@ -0,0 +1,67 @@
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich import print
+
+from vivamir.utility.logs import LogFollower, LogIndex
+from vivamir.vivamir import Vivamir
+
+
+def command_log_query(
+        message_id: Optional[str] = typer.Option(None, '--id', help='Message ID, wildcards allowed: "Synth 8-*".'),
+        severity: Optional[str] = typer.Option(None, help='Message severity: info, warning, critical warning, error.'),
+        file: Path = typer.Option(Path('vivado.log'), help='Log file, relative to the vivamir folder.'),
+        count: bool = typer.Option(False, help='Print how many messages match, per ID, instead.'),
+):
+    """ Prints matching messages from a Vivado log, using an incremental index. """
+
+    vivamir = Vivamir.search()
+    if vivamir is None:
+        print('[bold red]No vivamir configuration found in the current working directory.')
+        return 1
+
+    log = vivamir.root / 'vivamir' / file
+    if not log.exists():
+        print(f'[bold red]No log found at {log!s}.')
+        return 1
+
+    index = LogIndex.load(log, vivamir.cache)
+    if count:
+        for key_severity, key_id in index.keys(message_id, severity):
+            total = index.counts[f'{key_severity}\t{key_id}']
+            sys.stdout.write(f'{total:>8} {key_severity}: [{key_id}]\n')
+        return
+
+    for line in index.query(log, message_id, severity):
+        sys.stdout.write(f'{line}\n')
+
+
+def command_log_follow(
+        file: Path = typer.Option(Path('vivado.log'), help='Log file, relative to the vivamir folder.'),
+):
+    """ Prints new lines from a Vivado log as they are written, following rotations. """
+
+    vivamir = Vivamir.search()
+    if vivamir is None:
+        print('[bold red]No vivamir configuration found in the current working directory.')
+        return 1
+
+    follower = LogFollower(vivamir.root / 'vivamir' / file)
+    try:
+        while True:
+            for line in follower.poll():
+                sys.stdout.write(f'{line}\n')
+            sys.stdout.flush()
+            time.sleep(follower.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        follower.close()
+
+
+log = typer.Typer(help='Queries and follows Vivado logs.')
+log.command(name='query')(command_log_query)
+log.command(name='follow')(command_log_follow)
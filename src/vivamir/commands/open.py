@@ -4,14 +4,27 @@ import functools
 import pty
 import re
 import subprocess
+import threading
 from typing import Optional
 
-from rich import print
+import typer
+from rich import box, print
 from rich.console import Console
-
-from vivamir.commands.generate import command_generate
+from rich.table import Table
+
+from vivamir import manifest
+from vivamir.commands.generate import command_generate, generate_update
+from vivamir.ipcache import prune_ip_cache
+from vivamir.manifest import Manifest
+from vivamir.preflight import run_preflight
+from vivamir.utility.flood import FloodControl
+from vivamir.utility.logs import LogFollower
+from vivamir.utility.sampler import ResourceSampler, run_record, sampling
 from vivamir.vivamir import Vivamir
 
+# Printed by open.tcl once Vivado only writes to its log.
+FOLLOW_LOG = 'INFO: [Vivamir] Following vivado.log.'
+
 
 @dataclasses.dataclass()
 class TaskReport:
@@ -39,6 +52,70 @@ class TaskReport:
         return f'INFO: [vivamir::report] {self.task} in {self.elapsed}s'
 
 
+class VivadoOutput:
+    """ Prints Vivado output, highlighting messages by severity. Lines can be fed from multiple threads. """
+
+    def __init__(self, console: Console, flood: Optional[FloodControl] = None):
+        self.console = console
+        self.flood = flood
+        self.sampler: Optional[ResourceSampler] = None
+        self.buffer = ''
+        self.style = ''
+        self.lock = threading.Lock()
+
+    def feed(self, line: str):
+        with self.lock:
+            self._feed(line.rstrip())
+
+    def _feed(self, line: str):
+        if task := TaskReport.parse_if_match(line):
+            self.console.print(str(task), style='dim')
+            return
+
+        if line.startswith('##'):
+            return
+
+        line = line.removeprefix('# ')
+
+        if self.sampler is not None and line.startswith(('Starting ', 'Phase ')):
+            self.sampler.phase = line
+
+        if self.flood is not None:
+            shown = self.flood.feed(line)
+            if shown is None:
+                return
+            if shown is not line:
+                self.console.print(shown, style='dim', markup=False, highlight=False)
+                return
+
+        self.buffer += line
+
+        if line.startswith('INFO: '):
+            self.style = 'dim'
+
+        if line.startswith('WARNING: '):
+            self.style = 'yellow'
+
+        if line.startswith('CRITICAL WARNING: ') or line.startswith('ERROR: '):
+            self.style = 'bold red'
+
+        if line.endswith(':'):
+            return
+
+        self.console.print(line, style=self.style, markup=False, highlight=False)
+        self.buffer = ''
+        self.style = ''
+
+    def print_histogram(self):
+        if self.flood is None or not (histogram := self.flood.histogram()):
+            return
+
+        table = Table('Messages', 'Severity', 'ID', 'Hidden', box=box.SIMPLE)
+        for message_id, count in histogram:
+            table.add_row(str(count.total), count.severity, message_id, str(count.hidden or ''))
+        self.console.print(table)
+
+
 @contextlib.contextmanager
 def clean_vivado(vivamir: Vivamir, vivado_executable: list[str]):
     process = None
@@ -74,51 +151,68 @@ def clean_vivado(vivamir: Vivamir, vivado_executable: list[str]):
                 print('INFO: [Vivamir] Vivado terminated.')
 
 
-def command_open(vivado_executable: list[str]):
-    """ Runs Vivado and opens the GUI with a fresh project. """
+def _prepare_project(vivamir: Vivamir, fresh: bool):
+    current = Manifest.build(vivamir)
+    previous = Manifest.load(vivamir.root / manifest.CURRENT)
+    if not (vivamir.root / 'vivamir' / 'project' / f'{vivamir.name}.xpr').exists():
+        previous = None
+
+    if fresh or current.requires_rebuild(previous):
+        print('INFO: [Vivamir] Creating a fresh project...')
+        generate_update(vivamir, None)
+    else:
+        print('INFO: [Vivamir] Updating the existing project...')
+        generate_update(vivamir, current.delta(previous))
+
+    current.save(vivamir.root / manifest.PENDING)
+
+
+def command_open(vivado_executable: list[str], fresh: bool = False, all_messages: bool = False,
+                 check: bool = True, sample_interval: float = 1.0):
+    """
+    Runs Vivado and opens the GUI, reusing the existing project when possible.
+
+    With --fresh the project is always created again.
+    With --all-messages repeated messages are never hidden.
+    With --no-check sources are not checked before starting Vivado.
+    """
 
     vivamir = Vivamir.search()
     if vivamir is None:
         print('[bold red]No vivamir configuration found in the current working directory.')
         return 1
 
+    if check and not run_preflight(vivamir):
+        raise typer.Exit(1)
+
     print('INFO: [Vivamir] Regenerating scripts...')
     command_generate()
+    _prepare_project(vivamir, fresh)
 
-    console = Console()
-    buffer = ''
-    style = ''
+    flood = None
+    if not all_messages:
+        flood = FloodControl(vivamir.messages.limit, vivamir.messages.summary_every, vivamir.messages.limits)
 
-    with clean_vivado(vivamir, vivado_executable) as process:
+    output = VivadoOutput(Console(), flood)
+    follower = LogFollower(vivamir.root / 'vivamir' / 'vivado.log')
+
+    with clean_vivado(vivamir, vivado_executable) as process, contextlib.ExitStack() as stack:
+        output.sampler = stack.enter_context(
+            sampling(process, sample_interval, run_record(vivamir.root / 'vivamir', 'open'))
+        )
         while process.poll() is None:
             try:
                 line = process.stdout.readline().rstrip()
 
-                if task := TaskReport.parse_if_match(line):
-                    console.print(str(task), style='dim')
+                if line == FOLLOW_LOG:
+                    # Vivado stops writing to stdout once the GUI starts, continue from its log.
+                    stack.enter_context(follower.following(output.feed))
                     continue
 
-                if line.startswith('##'):
-                    continue
-
-                line = line.removeprefix('# ')
-                buffer += line
-
-                if line.startswith('INFO: '):
-                    style = 'dim'
-
-                if line.startswith('WARNING: '):
-                    style = 'yellow'
-
-                if line.startswith('CRITICAL WARNING: ') or line.startswith('ERROR: '):
-                    style = 'bold red'
-
-                if line.endswith(':'):
-                    continue
-
-                console.print(line, style=style, markup=False, highlight=False)
-                buffer = ''
-                style = ''
+                output.feed(line)
 
             except Exception as e:
                 print(f'ERROR: Python crashed with {e!s}')
+
+    output.print_histogram()
+    prune_ip_cache(vivamir)
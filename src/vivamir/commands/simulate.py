@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+import time
+
+import typer
+from rich import print
+
+from vivamir.commands.generate import command_generate
+from vivamir.files import FileIndex
+from vivamir.ipcache import prune_ip_cache
+from vivamir.preflight import run_preflight
+from vivamir.simulation import SimulationCache, SimulationResult, fingerprint
+from vivamir.utility.sampler import run_sampled
+from vivamir.vivamir import Vivamir
+from vivamir.xsim import XsimFlow
+
+
+def _report(result: SimulationResult):
+    """ Prints the outcome, exiting with an error when the simulation failed. """
+
+    if not result.passed:
+        print(f'[bold red]Simulation failed (exit code {result.code}).')
+        raise typer.Exit(1)
+
+    print('[green]Done!')
+
+
+def command_simulate(vivado_executable: list[str], force: bool = False, direct: bool = False,
+                     jobs: int = os.cpu_count() or 1, check: bool = True, sample_interval: float = 1.0):
+    """
+    Runs Vivado to simulate the simulation top in a fresh project.
+
+    The result is reused until any input of the simulation changes, with --force it always runs.
+    With --direct the sources are compiled by xvlog/xvhdl without a project, only the changed libraries,
+    up to --jobs at a time. Block designs are not available in this mode.
+    With --no-check sources are not checked before starting Vivado.
+    """
+
+    vivamir = Vivamir.search()
+    if vivamir is None:
+        print('[bold red]No vivamir configuration found in the current working directory.')
+        return 1
+
+    if check and not run_preflight(vivamir, jobs):
+        raise typer.Exit(1)
+
+    cache = SimulationCache(vivamir)
+    key = fingerprint(vivamir, FileIndex.load(vivamir)) + ('-direct' if direct else '')
+    if not force and (cached := cache.get(key)) is not None:
+        result, log = cached
+        sys.stdout.write(log.decode(errors='replace'))
+        print(f'INFO: [Vivamir] Inputs unchanged, reused the result of {vivamir.simulation_top} '
+              f'which took {result.duration:.0f}s. Use --force to run it again.')
+        _report(result)
+        return
+
+    if direct:
+        start = time.monotonic()
+        code, output = XsimFlow(vivamir, vivado_executable, jobs).run()
+        result = SimulationResult.of(code, output, time.monotonic() - start)
+        if code == 0:
+            cache.put(key, result, output)
+        _report(result)
+        return
+
+    print('INFO: [Vivamir] Regenerating scripts...')
+    command_generate()
+
+    log = vivamir.root / 'vivamir' / 'vivado.log'
+    started, start = time.time(), time.monotonic()
+    try:
+        run_sampled([
+            *vivado_executable, '-mode', 'batch', '-source', 'simulate.tcl'
+        ], vivamir.root / 'vivamir', sample_interval, 'simulate')
+        code = 0
+    except subprocess.CalledProcessError as error:
+        code = error.returncode
+    prune_ip_cache(vivamir)
+
+    # A log older than the run belongs to a previous one.
+    output = log.read_bytes() if log.exists() and log.stat().st_mtime >= started else b''
+    result = SimulationResult.of(code, output, time.monotonic() - start)
+    # A crashed Vivado says nothing about the simulation.
+    if code == 0:
+        cache.put(key, result, output)
+
+    _report(result)
@@ -0,0 +1,108 @@
+import datetime
+import os
+
+import typer
+from rich import box, print
+from rich.table import Table
+
+from vivamir.snapshot import SnapshotInfo, Snapshots, fingerprint
+from vivamir.utility.units import format_size
+from vivamir.vivamir import Vivamir
+
+
+def _valid_name(name: str) -> bool:
+    return name not in ('', '.', '..') and not name.startswith('.') and '/' not in name and os.sep not in name
+
+
+def command_snapshot_save(name: str, jobs: int = os.cpu_count() or 1):
+    """
+    Saves the generated project as a snapshot, replacing any other with the same name.
+
+    Close Vivado first, files it is still writing would be saved half done.
+    """
+
+    vivamir = Vivamir.search()
+    if vivamir is None:
+        print('[bold red]No vivamir configuration found in the current working directory.')
+        return 1
+
+    if not _valid_name(name):
+        print(f'[bold red]Invalid snapshot name {name}.')
+        return 1
+
+    project = vivamir.root / 'vivamir' / 'project'
+    if not (project / f'{vivamir.name}.xpr').exists():
+        print('[bold red]No project to save, create it with open first.')
+        return 1
+
+    report = Snapshots.of(vivamir).save(name, project, fingerprint(vivamir), jobs)
+    print(f'INFO: [Vivamir] Saved {report.files} files, {format_size(report.size)} '
+          f'of which {format_size(report.copied)} new, in {report.seconds:.1f}s.')
+
+
+def command_snapshot_restore(name: str, jobs: int = os.cpu_count() or 1):
+    """
+    Replaces the generated project with a snapshot, taken with the same project configuration.
+
+    Open then only applies the changes made to sources since the snapshot.
+    """
+
+    vivamir = Vivamir.search()
+    if vivamir is None:
+        print('[bold red]No vivamir configuration found in the current working directory.')
+        return 1
+
+    if not _valid_name(name):
+        print(f'[bold red]No snapshot named {name}.')
+        return 1
+
+    try:
+        report = Snapshots.of(vivamir).restore(name, vivamir.root / 'vivamir' / 'project', fingerprint(vivamir), jobs)
+    except ValueError as error:
+        print(f'[bold red]{error!s}')
+        return 1
+
+    print(f'INFO: [Vivamir] Restored {report.files} files, {format_size(report.copied)} '
+          f'of {format_size(report.size)} copied, in {report.seconds:.1f}s.')
+
+
+def command_snapshot_list():
+    """ Prints every snapshot, least recently used first. """
+
+    vivamir = Vivamir.search()
+    if vivamir is None:
+        print('[bold red]No vivamir configuration found in the current working directory.')
+        return 1
+
+    snapshots = Snapshots.of(vivamir)
+    key = fingerprint(vivamir)
+    table = Table('Name', 'Files', 'Size', 'Last use', 'Restorable', box=box.SIMPLE)
+    for entry, size, last_use in snapshots.entries():
+        if (info := SnapshotInfo.load(entry)) is None:
+            continue
+        table.add_row(entry.name, str(len(info.files)), format_size(size),
+                      datetime.datetime.fromtimestamp(last_use).strftime('%Y-%m-%d %H:%M'),
+                      'yes' if info.fingerprint == key else 'no')
+    print(table)
+    if snapshots.objects.is_dir():
+        print(f'{format_size(snapshots.size())} used of {format_size(snapshots.max_size)}.')
+
+
+def command_snapshot_remove(name: str):
+    """ Removes a snapshot, freeing the files no other snapshot shares. """
+
+    vivamir = Vivamir.search()
+    if vivamir is None:
+        print('[bold red]No vivamir configuration found in the current working directory.')
+        return 1
+
+    if not _valid_name(name) or not Snapshots.of(vivamir).remove(name):
+        print(f'[bold red]No snapshot named {name}.')
+        return 1
+
+
+snapshot = typer.Typer(help='Saves and restores copies of the generated project, as when switching branches.')
+snapshot.command(name='save')(command_snapshot_save)
+snapshot.command(name='restore')(command_snapshot_restore)
+snapshot.command(name='list')(command_snapshot_list)
+snapshot.command(name='remove')(command_snapshot_remove)
@@ -1,9 +1,22 @@
+import json
+import sys
+from enum import Enum
+from typing import Optional
+
 import typer
 from rich import print
 
+from vivamir.files import FileIndex, INCLUDE, VALID_EXTENSIONS
 from vivamir.vivamir import Vivamir, FilesetKind
 
 
+class Format(str, Enum):
+    PLAIN = 'plain'
+    JSON = 'json'
+    JSONL = 'jsonl'
+    NUL = 'nul'
+
+
 def command_sources(simulation: bool = False):
     """ Prints the current project's sources paths. """
 
@@ -33,6 +46,43 @@ def command_includes():
     print(*vivamir.includes, sep='\n')
 
 
+def command_files(
+        kind: Optional[list[str]] = typer.Option(
+            None, help=f'Kinds to list, any of: {", ".join([*(k.value for k in FilesetKind), INCLUDE])}.'),
+        ext: Optional[list[str]] = typer.Option(
+            None, help=f'Extensions to list, defaults to: {", ".join(VALID_EXTENSIONS)}.'),
+        output_format: Format = typer.Option(Format.PLAIN, '--format', help='Output format.'),
+):
+    """ Prints the current project's expanded files, after extension and ignore filtering. """
+
+    vivamir = Vivamir.search()
+    if vivamir is None:
+        print('[bold red]No vivamir configuration found in the current working directory.')
+        return 1
+
+    kinds = kind or [*(k.value for k in FilesetKind), INCLUDE]
+    if unknown := set(kinds) - {*(k.value for k in FilesetKind), INCLUDE}:
+        print(f'[bold red]Unknown kinds: {", ".join(sorted(unknown))}')
+        return 1
+
+    extensions = [e if e.startswith('.') else f'.{e}' for e in ext] if ext else VALID_EXTENSIONS
+    files = [
+        {'path': str(vivamir.root / file), 'kind': file_kind, 'read_only': read_only}
+        for file_kind, file, read_only in FileIndex.load(vivamir).select(kinds, extensions)
+    ]
+
+    match output_format:
+        case Format.PLAIN:
+            sys.stdout.write(''.join(f'{file["path"]}\n' for file in files))
+        case Format.JSON:
+            json.dump(files, sys.stdout)
+            sys.stdout.write('\n')
+        case Format.JSONL:
+            sys.stdout.write(''.join(f'{json.dumps(file)}\n' for file in files))
+        case Format.NUL:
+            sys.stdout.write(''.join(f'{file["path"]}\0' for file in files))
+
+
 def command_sources_default(ctx: typer.Context):
     if ctx.invoked_subcommand is not None:
         return
@@ -44,3 +94,4 @@ sources = typer.Typer(help='Prints configured sources in a machine readable way.
 sources.callback(invoke_without_command=True)(command_sources_default)
 sources.command(name='sources')(command_sources)
 sources.command(name='includes')(command_includes)
+sources.command(name='files')(command_files)
@@ -0,0 +1,127 @@
+import dataclasses
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import typer
+from rich import print
+from rich.console import Console
+from rich.markup import escape
+
+from vivamir.vivamir import Vivamir
+
+
+@dataclasses.dataclass(slots=True)
+class Workspace:
+    root: Path
+    projects: list[Path]
+    jobs: int
+
+    def prefix(self, project: Path) -> str:
+        return str(project.relative_to(self.root)) if project != self.root else project.name
+
+
+def _run_project(workspace: Workspace, project: Path, arguments: list[str], console: Console,
+                 lock: threading.Lock) -> int:
+    prefix = escape(f'[{workspace.prefix(project)}]')
+    process = subprocess.Popen(
+        args=[sys.executable, '-m', 'vivamir.main', *arguments],
+        cwd=project,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+
+    for line in process.stdout:
+        with lock:
+            console.print(f'[blue]{prefix}[/blue] {escape(line.rstrip())}', highlight=False, soft_wrap=True)
+
+    return process.wait()
+
+
+def run_across(workspace: Workspace, arguments: list[str]) -> int:
+    """ Runs a vivamir command in every project, returning the aggregated exit status. """
+
+    console = Console()
+    lock = threading.Lock()
+
+    with ThreadPoolExecutor(max_workers=workspace.jobs) as pool:
+        codes = list(pool.map(
+            lambda project: _run_project(workspace, project, arguments, console, lock),
+            workspace.projects,
+        ))
+
+    failed = [project for project, code in zip(workspace.projects, codes) if code != 0]
+    for project in failed:
+        print(f'[bold red]Failed:[/bold red] {workspace.prefix(project)}')
+
+    print(f'{len(workspace.projects) - len(failed)}/{len(workspace.projects)} projects succeeded.')
+    return 1 if failed else 0
+
+
+def command_workspace_default(
+        ctx: typer.Context,
+        path: Path = typer.Option(Path('.'), help='Folder to search for projects.'),
+        jobs: int = typer.Option(os.cpu_count() or 1, help='Maximum number of projects processed concurrently.'),
+):
+    root = path.resolve()
+    projects = Vivamir.discover(root)
+    ctx.obj = Workspace(root=root, projects=projects, jobs=max(1, jobs))
+
+    if len(projects) == 0:
+        print(f'[bold red]No vivamir configuration found under {root!s}.')
+        raise typer.Exit(1)
+
+    if ctx.invoked_subcommand is None:
+        print(*map(ctx.obj.prefix, projects), sep='\n')
+
+
+def command_workspace_generate(ctx: typer.Context):
+    """ Generates Tcl scripts in every project. """
+
+    raise typer.Exit(run_across(ctx.obj, ['generate', *ctx.args]))
+
+
+def command_workspace_export(ctx: typer.Context, yes: bool = False):
+    """ Runs Vivado to export BDs and sources in every project. """
+
+    if not yes:
+        print('[bold orange]This command will overwrite files in every project!')
+        if not typer.confirm('Is the VCS all good?', default=False):
+            print('Aborted.')
+            return
+
+    raise typer.Exit(run_across(ctx.obj, ['export', *ctx.args, '--yes']))
+
+
+def command_workspace_list(ctx: typer.Context):
+    """ Prints configured sources of every project. """
+
+    raise typer.Exit(run_across(ctx.obj, ['list', *ctx.args]))
+
+
+def command_workspace_simulate(ctx: typer.Context):
+    """ Runs Vivado to simulate every project. """
+
+    raise typer.Exit(run_across(ctx.obj, ['simulate', *ctx.args]))
+
+
+def command_workspace_build(ctx: typer.Context):
+    """ Runs Vivado to build every project up to the bitstream. """
+
+    raise typer.Exit(run_across(ctx.obj, ['build', *ctx.args]))
+
+
+_FORWARD = {'allow_extra_args': True, 'ignore_unknown_options': True}
+
+workspace = typer.Typer(help='Runs commands across every project found below a folder.')
+workspace.callback(invoke_without_command=True)(command_workspace_default)
+workspace.command(name='generate', context_settings=_FORWARD)(command_workspace_generate)
+workspace.command(name='export', context_settings=_FORWARD)(command_workspace_export)
+workspace.command(name='list', context_settings=_FORWARD)(command_workspace_list)
+workspace.command(name='simulate', context_settings=_FORWARD)(command_workspace_simulate)
+workspace.command(name='build', context_settings=_FORWARD)(command_workspace_build)
@@ -0,0 +1,140 @@
+import dataclasses
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from vivamir.vivamir import Vivamir, FilesetKind
+
+# Mirrors `valid_extensions` in the generated Tcl scripts.
+VALID_EXTENSIONS = ('.v', '.vh', '.sv', '.svh', '.vhdl')
+
+# Kind of the include folders, next to the fileset kinds.
+INCLUDE = 'include'
+
+
+def ignored(vivamir: Vivamir) -> set[str]:
+    """ Absolute paths matched by the ignore list, like `glob -directory $::root` does. """
+
+    return set(str(file) for pattern in vivamir.ignore.list for file in vivamir.root.glob(str(pattern)))
+
+
+def rglob(folders: Iterable[Path]) -> Iterator[Path]:
+    """ Recursively yields non-hidden files with an extension, like the `rglob` Tcl proc does. """
+
+    for folder in folders:
+        for current, directories, files in os.walk(folder):
+            directories[:] = sorted(directory for directory in directories if not directory.startswith('.'))
+            for file in sorted(files):
+                if not file.startswith('.') and '.' in file:
+                    yield Path(current) / file
+
+
+def folders(vivamir: Vivamir, kind: Optional[FilesetKind] = None, read_only: Optional[bool] = None) -> list[Path]:
+    """ Absolute folders of the filesets of the given kind, or of the includes when kind is None. """
+
+    if kind is None:
+        return [vivamir.root / include.path for include in vivamir.includes]
+
+    return [vivamir.root / fileset.path for fileset in vivamir.filesets
+            if fileset.kind == kind and (read_only is None or fileset.read_only == read_only)]
+
+
+def expand(vivamir: Vivamir, folders: Iterable[Path], extensions: tuple[str, ...] = VALID_EXTENSIONS) -> list[Path]:
+    """ Files inside the folders with a valid extension which are not ignored, like `vivamir_expand` does. """
+
+    ignores = ignored(vivamir)
+    return [file for file in rglob(folders) if file.suffix in extensions and str(file) not in ignores]
+
+
+@dataclasses.dataclass(slots=True)
+class FileIndex:
+    """ Cached expansion of every fileset, valid until a scanned folder, a fileset or the configuration changes. """
+
+    # Configuration file to mtime.
+    config: dict[str, int]
+    # Kind to its folders as [folder, read only], filesets from `exec` can change without the configuration.
+    roots: dict[str, list[list]]
+    # Scanned folder to mtime, which changes whenever a file is added, removed or renamed inside it.
+    folders: dict[str, int]
+    # Kind to (file relative to root, read only), for every file with an extension.
+    files: dict[str, list[tuple[str, bool]]]
+
+    @staticmethod
+    def _mtime(folder: str) -> int:
+        try:
+            return os.stat(folder).st_mtime_ns
+        except FileNotFoundError:
+            return -1
+
+    @staticmethod
+    def _config(vivamir: Vivamir) -> dict[str, int]:
+        config = [vivamir.root / 'vivamir.toml']
+        if vivamir.ignore.include is not None:
+            config.append(vivamir.root / vivamir.ignore.include)
+        return {str(file): file.stat().st_mtime_ns for file in config}
+
+    @staticmethod
+    def _roots(vivamir: Vivamir) -> dict[str, list[list]]:
+        return {
+            **{kind.value: [[str(vivamir.root / f.path), f.read_only] for f in vivamir.filesets if f.kind == kind]
+               for kind in FilesetKind},
+            INCLUDE: [[str(folder), False] for folder in folders(vivamir)],
+        }
+
+    @classmethod
+    def build(cls, vivamir: Vivamir) -> 'FileIndex':
+        ignores = ignored(vivamir)
+        scanned = {}
+        roots = cls._roots(vivamir)
+
+        files = {}
+        for kind, kind_roots in roots.items():
+            files[kind] = []
+            for root, read_only in kind_roots:
+                scanned[str(root)] = cls._mtime(str(root))
+                for current, directories, names in os.walk(root):
+                    scanned[current] = cls._mtime(current)
+                    directories[:] = sorted(directory for directory in directories if not directory.startswith('.'))
+                    for name in sorted(names):
+                        file = os.path.join(current, name)
+                        if not name.startswith('.') and '.' in name and file not in ignores:
+                            files[kind].append((os.path.relpath(file, vivamir.root), read_only))
+
+        return cls(config=cls._config(vivamir), roots=roots, folders=scanned, files=files)
+
+    @classmethod
+    def load(cls, vivamir: Vivamir) -> 'FileIndex':
+        """ Loads the cached index, scanning the filesets again only when it is stale. """
+
+        path = vivamir.cache / 'files.json'
+        try:
+            index = cls(**json.loads(path.read_text()))
+            if index.valid(vivamir):
+                return index
+        except (OSError, ValueError, TypeError):
+            pass
+
+        index = cls.build(vivamir)
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(dataclasses.asdict(index)))
+        temporary.replace(path)
+        return index
+
+    def valid(self, vivamir: Vivamir) -> bool:
+        try:
+            return self.config == self._config(vivamir) and self.roots == self._roots(vivamir) and all(
+                self._mtime(folder) == mtime for folder, mtime in self.folders.items()
+            )
+        except OSError:
+            return False
+
+    def select(self, kinds: Iterable[str], extensions: Optional[Iterable[str]] = VALID_EXTENSIONS
+               ) -> Iterator[tuple[str, str, bool]]:
+        """ Yields (kind, relative file, read only) for the given kinds and extensions, or any when None. """
+
+        extensions = None if extensions is None else tuple(extensions)
+        for kind in kinds:
+            for file, read_only in self.files.get(kind, []):
+                if extensions is None or os.path.splitext(file)[1] in extensions:
+                    yield kind, file, read_only
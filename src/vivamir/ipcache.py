@@ -0,0 +1,59 @@
+import os
+import re
+from pathlib import Path
+
+from rich import print
+
+from vivamir.settings import Settings
+from vivamir.utility.cache import LruCache
+from vivamir.utility.paths import user_cache
+from vivamir.vivamir import Vivamir
+
+# Vivado names every cached IP after the hash of its configuration.
+_ENTRY_PATTERN = re.compile(r'^[0-9a-f]{16}$')
+
+
+def ip_cache_folder() -> Path:
+    """ Mirrors `vivamir_ip_cache` in the generated Tcl scripts, without the version and part. """
+
+    return user_cache() / 'ip'
+
+
+class IpCache(LruCache):
+    """
+    Vivado IP cache shared by every project of the user, one folder per Vivado version and part.
+
+    Vivado fills it with output products and out-of-context synthesis results, keyed on the configuration of
+    each IP, block design IPs included. Vivamir only evicts the least recently used entries above the size of the
+    user settings, and never those used within their grace period, which other projects may still rely on.
+    """
+
+    @classmethod
+    def of(cls) -> 'IpCache':
+        settings = Settings.load()
+        return cls(ip_cache_folder(), settings.ip_cache_size * 2 ** 20, settings.ip_cache_grace * 3600)
+
+    def _entries(self) -> list[Path]:
+        entries = []
+        for current, folders, _ in os.walk(self.folder):
+            for folder in folders:
+                if _ENTRY_PATTERN.match(folder):
+                    entries.append(Path(current) / folder)
+            folders[:] = [folder for folder in folders if not _ENTRY_PATTERN.match(folder)]
+        return entries
+
+    def _last_use(self, entry: Path) -> float:
+        # Vivado only reads entries on a hit, access times are the best hint available.
+        last_use = entry.stat().st_mtime
+        for current, _, files in os.walk(entry):
+            for file in files:
+                stat = os.stat(os.path.join(current, file))
+                last_use = max(last_use, stat.st_atime, stat.st_mtime)
+        return last_use
+
+
+def prune_ip_cache(vivamir: Vivamir):
+    """ Evicts the least recently used IPs once Vivado is done, when the cache is enabled. """
+
+    if vivamir.project.ip_cache and (removed := IpCache.of().evict()):
+        print(f'INFO: [Vivamir] Evicted {removed} IPs from the cache.')
@@ -1,12 +1,19 @@
 import typer
 from rich import print
 
+from vivamir.commands.build import command_build
+from vivamir.commands.cache import cache
+from vivamir.commands.check import command_check
 from vivamir.commands.export import command_export
 from vivamir.commands.generate import command_generate
 from vivamir.commands.init import command_init
+from vivamir.commands.log import log
 from vivamir.commands.open import command_open
 from vivamir.commands.remote import command_remote
+from vivamir.commands.simulate import command_simulate
+from vivamir.commands.snapshot import snapshot
 from vivamir.commands.sources import sources
+from vivamir.commands.workspace import workspace
 from vivamir.utility.version import SemanticVersion
 from vivamir.vivamir import Vivamir
 
@@ -21,12 +28,12 @@ def commands_version():
 def command_root():
     """ Prints the current project's root folder. """
 
-    vivamir = Vivamir.search()
-    if vivamir is None:
+    root = Vivamir.search_root()
+    if root is None:
         print('[bold red]No vivamir configuration found in the current working directory.')
         return 1
 
-    print(vivamir.root)
+    print(root)
 
 
 def command_debug():
@@ -37,6 +44,7 @@ def command_debug():
         print('[bold red]No vivamir configuration found in the current working directory.')
         return 1
 
+    vivamir.check()
     print(vivamir)
 
 
@@ -45,10 +53,17 @@ main.command(name='version')(commands_version)
 main.command(name='root')(command_root)
 main.add_typer(sources, name='list')
 main.command(name='init')(command_init)
+main.command(name='check')(command_check)
 main.command(name='generate')(command_generate)
 main.command(name='open')(command_open)
 main.command(name='export')(command_export)
+main.command(name='simulate')(command_simulate)
+main.command(name='build')(command_build)
 main.command(name='remote')(command_remote)
+main.add_typer(workspace, name='workspace')
+main.add_typer(log, name='log')
+main.add_typer(cache, name='cache')
+main.add_typer(snapshot, name='snapshot')
 main.command(name='debug', hidden=True)(command_debug)
 
 
@@ -0,0 +1,144 @@
+import dataclasses
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+from vivamir import files
+from vivamir.utility.version import SemanticVersion
+from vivamir.vivamir import Vivamir, FilesetKind
+
+# Written next to the scripts, moved inside the project by Vivado once the project matches it.
+PENDING = Path('vivamir') / 'vivamir.manifest.json'
+CURRENT = Path('vivamir') / 'project' / 'vivamir.manifest.json'
+
+
+@dataclasses.dataclass(slots=True)
+class Delta:
+    """ Changes to apply to an existing project, keyed by Vivado fileset name. """
+
+    removed: dict[str, list[str]]
+    added: dict[str, list[str]]
+    imported: dict[str, list[str]]
+    includes: bool
+    ip_catalog: bool
+    block_designs_removed: list[str]
+    block_designs_added: list[str]
+    settings: bool
+
+    def kinds(self) -> list[str]:
+        return [kind for kind in self.added if self.removed[kind] or self.added[kind]]
+
+
+@dataclasses.dataclass(slots=True)
+class Manifest:
+    """ What the generated project contains, so that it can be updated instead of created again. """
+
+    # Any change here requires a full rebuild.
+    project: dict[str, str]
+    # Fileset name to file path to (mtime, size, read only).
+    files: dict[str, dict[str, list[int]]]
+    includes: list[str]
+    # Packaged IP definition to (mtime, size).
+    ips: dict[str, list[int]]
+    # Block design script to content hash.
+    block_designs: dict[str, str]
+    settings: dict[str, list[str]]
+
+    @classmethod
+    def build(cls, vivamir: Vivamir) -> 'Manifest':
+        def _fingerprint(file: Path, read_only: set[str] = frozenset()) -> list[int]:
+            stat = file.stat()
+            return [stat.st_mtime_ns, stat.st_size, int(str(file) in read_only)]
+
+        read_only = set(map(str, [
+            *files.expand(vivamir, files.folders(vivamir, FilesetKind.DES, read_only=True)),
+            *files.expand(vivamir, files.folders(vivamir, FilesetKind.SIM, read_only=True)),
+        ]))
+
+        design = [
+            *files.expand(vivamir, files.folders(vivamir, FilesetKind.DES)),
+            *files.expand(vivamir, files.folders(vivamir)),
+        ]
+        simulation = files.expand(vivamir, files.folders(vivamir, FilesetKind.SIM))
+
+        ip_repo = vivamir.root / vivamir.ips.user_ip_repo_path
+        waveforms = (vivamir.root / vivamir.first_fileset(FilesetKind.SIM).path).rglob('*.wcfg')
+
+        return cls(
+            project={
+                'vivamir': str(SemanticVersion.project()),
+                'name': vivamir.name,
+                'version': vivamir.vivado.version,
+                'part': vivamir.vivado.part,
+                'board': vivamir.vivado.board,
+                'board_long': vivamir.vivado.board_long,
+                'link': str(vivamir.project.link),
+                'ip_cache': str(vivamir.project.ip_cache),
+            },
+            files={
+                FilesetKind.DES.vivado_name: {str(file): _fingerprint(file, read_only) for file in design},
+                FilesetKind.SIM.vivado_name: {str(file): _fingerprint(file, read_only) for file in simulation},
+            },
+            includes=[str(folder) for folder in files.folders(vivamir)],
+            ips={str(file): _fingerprint(file)[:2] for file in sorted(ip_repo.rglob('component.xml'))},
+            block_designs={
+                str(vivamir.root / bd): hashlib.sha256((vivamir.root / bd).read_bytes()).hexdigest()
+                for bd in vivamir.block_designs.trusted
+            },
+            settings={
+                'tops': [vivamir.design_top, vivamir.simulation_top],
+                'properties': [prop.as_tcl() for prop in vivamir.vivado.properties],
+                'waveforms': sorted(str(waveform) for waveform in waveforms),
+            },
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['Manifest']:
+        try:
+            return cls(**json.loads(path.read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, path: Path):
+        path.write_text(json.dumps(dataclasses.asdict(self)))
+
+    def requires_rebuild(self, previous: Optional['Manifest']) -> bool:
+        return previous is None or previous.project != self.project
+
+    def delta(self, previous: 'Manifest') -> Delta:
+        link = self.project['link'] == str(True)
+        removed, added, imported = {}, {}, {}
+
+        for kind, after in self.files.items():
+            before = previous.files.get(kind, {})
+            removed[kind] = [file for file in before if file not in after]
+            added[kind] = [file for file in after if file not in before]
+
+            for file in sorted(after.keys() & before.keys()):
+                if before[file] == after[file]:
+                    continue
+
+                # Linked files are edited in place, unless they also changed read-only state.
+                if link and not before[file][2] and not after[file][2]:
+                    continue
+
+                removed[kind].append(file)
+                added[kind].append(file)
+
+            imported[kind] = [file for file in added[kind] if not link or after[file][2]]
+
+        changed_design = added[FilesetKind.DES.vivado_name] or removed[FilesetKind.DES.vivado_name]
+
+        return Delta(
+            removed=removed,
+            added=added,
+            imported=imported,
+            includes=self.includes != previous.includes or bool(changed_design),
+            ip_catalog=self.ips != previous.ips,
+            block_designs_removed=[bd for bd, digest in previous.block_designs.items()
+                                   if self.block_designs.get(bd) != digest],
+            block_designs_added=[bd for bd, digest in self.block_designs.items()
+                                 if previous.block_designs.get(bd) != digest],
+            settings=self.settings != previous.settings,
+        )
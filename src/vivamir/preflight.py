@@ -0,0 +1,120 @@
+import dataclasses
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from rich import print
+from rich.markup import escape
+
+from vivamir.files import FileIndex, INCLUDE, folders
+from vivamir.utility import git, hdl
+from vivamir.utility.version import SemanticVersion
+from vivamir.vivamir import Vivamir, FilesetKind
+
+# Below this many files to check, starting worker processes costs more than it saves.
+_POOL_THRESHOLD = 64
+# Bumped whenever `hdl.check` changes what it reports, so that cached results are not reused.
+_CHECK_FORMAT = 3
+
+
+@dataclasses.dataclass(slots=True)
+class Diagnostic:
+    file: str
+    line: int
+    message: str
+    # Warnings are printed, only errors stop Vivado from starting.
+    warning: bool = False
+
+    def __str__(self) -> str:
+        return f'{self.file}:{self.line}: {self.message}'
+
+
+def _results(vivamir: Vivamir, files: list[Path], jobs: Optional[int]) -> dict[str, dict]:
+    """ Check results of every file, keyed by absolute path, cached by content hash. """
+
+    path = vivamir.cache / 'check.json'
+    version = f'{SemanticVersion.project()!s}/{_CHECK_FORMAT}'
+    try:
+        cached = json.loads(path.read_text())
+        cache = cached['files'] if cached['version'] == version else {}
+    except (OSError, ValueError, KeyError, TypeError):
+        cache = {}
+
+    hashes = git.fingerprints(vivamir.root, files)
+    missing = sorted(set(str(file) for file in files if hashes.get(str(file)) not in cache))
+    if len(missing) >= _POOL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            checked = list(pool.map(hdl.check, missing, chunksize=32))
+    else:
+        checked = [hdl.check(file) for file in missing]
+
+    for file, result in zip(missing, checked):
+        cache[hashes[file]] = result
+
+    # Only what is still in use is kept.
+    cache = {digest: cache[digest] for digest in set(hashes.values())}
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps({'version': version, 'files': cache}))
+    temporary.replace(path)
+
+    return {file: cache[digest] for file, digest in hashes.items()}
+
+
+def preflight(vivamir: Vivamir, jobs: Optional[int] = None) -> list[Diagnostic]:
+    """ Syntax checks every source, and checks that includes resolve and the top modules exist. """
+
+    index = FileIndex.load(vivamir)
+    kinds = {kind: [vivamir.root / file for _, file, _ in index.select([kind])]
+             for kind in [*(kind.value for kind in FilesetKind), INCLUDE]}
+    # The same file can be in more than one kind, as with headers in the design folders.
+    files = sorted(set(file for kind_files in kinds.values() for file in kind_files))
+    results = _results(vivamir, files, jobs)
+    # Headers in the filesets are found by name in project mode, their folders are searched as the build does.
+    include_dirs = [*folders(vivamir),
+                    *sorted(set(file.parent for file in files if file.suffix in hdl.HEADER_EXTENSIONS))]
+
+    def _relative(file: Path) -> str:
+        return str(file.relative_to(vivamir.root))
+
+    diagnostics = []
+    for file in files:
+        result = results[str(file)]
+        diagnostics.extend(Diagnostic(_relative(file), line, message) for line, message in result['errors'])
+        diagnostics.extend(Diagnostic(_relative(file), line, message, warning=True)
+                           for line, message in result['warnings'])
+        for name, line in result['includes']:
+            if hdl.resolve_include(name, file, include_dirs) is None:
+                diagnostics.append(Diagnostic(_relative(file), line, f'Included file "{name}" not found.'))
+
+    def _declared(kind_names: list[str]) -> set[str]:
+        return set(unit for kind in kind_names for file in kinds[kind] for unit in results[str(file)]['units'])
+
+    # Block designs are wrapped by Vivado, the wrapper is a common top.
+    wrappers = set(f'{Path(bd).stem}_wrapper' for bd in vivamir.block_designs.trusted)
+    design = _declared([FilesetKind.DES.value]) | wrappers
+    simulation = design | _declared([FilesetKind.SIM.value])
+    config = (vivamir.root / 'vivamir.toml').read_text().splitlines()
+    for key, declared in [('design_top', design), ('simulation_top', simulation)]:
+        top = getattr(vivamir, key)
+        # VHDL units are case insensitive, and stored in lower case.
+        if top and top not in declared and top.lower() not in declared:
+            line = next((number for number, text in enumerate(config, 1) if text.startswith(key)), 1)
+            diagnostics.append(Diagnostic('vivamir.toml', line, f'{key} {top} is not declared by any source.'))
+
+    return diagnostics
+
+
+def run_preflight(vivamir: Vivamir, jobs: Optional[int] = None) -> bool:
+    """ Prints the diagnostics, if any, returning whether it is fine to start Vivado. """
+
+    diagnostics = preflight(vivamir, jobs)
+    for diagnostic in diagnostics:
+        if diagnostic.warning:
+            print(f'[yellow]WARNING:[/yellow] [Vivamir] {escape(str(diagnostic))}')
+        else:
+            print(f'[bold red]ERROR:[/bold red] [Vivamir] {escape(str(diagnostic))}')
+
+    if errors := sum(not diagnostic.warning for diagnostic in diagnostics):
+        print(f'[bold red]Found {errors} problems, fix them or skip the check with --no-check.')
+    return not errors
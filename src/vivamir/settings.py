@@ -0,0 +1,30 @@
+import dataclasses
+import tomllib
+from pathlib import Path
+
+import dacite
+
+from vivamir.utility.paths import user_config
+
+
+@dataclasses.dataclass(slots=True)
+class Settings:
+    """ Settings of the user, shared by every project, read from `settings.toml` in the user config folder. """
+
+    # MiB of cached IPs to keep, the least recently used are removed first.
+    ip_cache_size: int = dataclasses.field(default=8192)
+    # Hours a cached IP is kept after its last use, whatever the size.
+    ip_cache_grace: int = dataclasses.field(default=168)
+
+    @staticmethod
+    def path() -> Path:
+        return user_config() / 'settings.toml'
+
+    @classmethod
+    def load(cls) -> 'Settings':
+        try:
+            text = cls.path().read_text()
+        except FileNotFoundError:
+            return cls()
+
+        return dacite.from_dict(cls, tomllib.loads(text), dacite.Config(strict=True))
@@ -0,0 +1,73 @@
+import dataclasses
+import hashlib
+import json
+import re
+from typing import Optional
+
+from vivamir.files import FileIndex, INCLUDE
+from vivamir.utility import git
+from vivamir.utility.cache import LruCache
+from vivamir.utility.version import SemanticVersion
+from vivamir.vivamir import Vivamir, FilesetKind
+
+# Vivado errors, and the messages of `$error` and `$fatal` printed by xsim.
+FAILURE_PATTERN = re.compile(rb'^(ERROR|FATAL_ERROR|Error|Fatal):', re.MULTILINE)
+
+
+def fingerprint(vivamir: Vivamir, index: FileIndex) -> str:
+    """ Hash of everything the simulation of the simulation top depends on. """
+
+    kinds = [kind.value for kind in FilesetKind] + [INCLUDE]
+    # Any file can be read by the testbench, waveforms and memory files included.
+    files = sorted(set(file for _, file, _ in index.select(kinds, extensions=None)))
+    # Packaged user IPs are simulated from their own sources.
+    ip_repo = vivamir.root / vivamir.ips.user_ip_repo_path
+    ips = sorted(str(file.relative_to(vivamir.root)) for file in ip_repo.rglob('*') if file.is_file())
+    hashes = git.fingerprints(vivamir.root, [vivamir.root / file for file in [*files, *ips]])
+
+    inputs = {
+        'vivamir': str(SemanticVersion.project()),
+        'top': vivamir.simulation_top,
+        'vivado': [vivamir.vivado.version, vivamir.vivado.part, vivamir.vivado.board_long],
+        # Any property can change the simulation, from generics on sim_1 to the target language of the project.
+        'properties': [prop.as_tcl() for prop in vivamir.vivado.properties or []],
+        'block_designs': [str(bd) for bd in vivamir.block_designs.trusted],
+        'files': {file: hashes.get(str(vivamir.root / file)) for file in files},
+        'ips': {file: hashes.get(str(vivamir.root / file)) for file in ips},
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+@dataclasses.dataclass(slots=True)
+class SimulationResult:
+    passed: bool
+    code: int
+    # Seconds taken by the original run.
+    duration: float
+
+    @classmethod
+    def of(cls, code: int, log: bytes, duration: float) -> 'SimulationResult':
+        return cls(passed=code == 0 and FAILURE_PATTERN.search(log) is None, code=code, duration=duration)
+
+
+class SimulationCache:
+    """ Results and logs of past simulations, by fingerprint. """
+
+    def __init__(self, vivamir: Vivamir):
+        self.cache = LruCache(vivamir.cache / 'simulation', vivamir.simulation.cache_size * 2 ** 20)
+
+    def get(self, key: str) -> Optional[tuple[SimulationResult, bytes]]:
+        if (entry := self.cache.get(key)) is None:
+            return None
+
+        try:
+            result = SimulationResult(**json.loads((entry / 'result.json').read_text()))
+            return result, (entry / 'vivado.log').read_bytes()
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, key: str, result: SimulationResult, log: bytes):
+        self.cache.put(key, {
+            'result.json': json.dumps(dataclasses.asdict(result)).encode(),
+            'vivado.log': log,
+        })
@@ -0,0 +1,243 @@
+import contextlib
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from vivamir.manifest import Manifest
+from vivamir.utility.cache import LruCache
+from vivamir.utility.transfer import copy_file
+from vivamir.vivamir import Vivamir
+
+
+def fingerprint(vivamir: Vivamir) -> str:
+    """ Hash of the configuration a project is created from, snapshots only fit projects with the same. """
+
+    return hashlib.sha256(json.dumps(Manifest.build(vivamir).project, sort_keys=True).encode()).hexdigest()
+
+
+def _digest(file: Path) -> str:
+    with open(file, 'rb') as reader:
+        return hashlib.file_digest(reader, 'sha256').hexdigest()
+
+
+@dataclasses.dataclass(slots=True)
+class SnapshotInfo:
+    fingerprint: str
+    # Seconds since the epoch.
+    created: float
+    # Relative path to (digest, mode, mtime in ns), symbolic links to their target.
+    files: dict[str, list]
+    links: dict[str, str]
+    folders: list[str]
+
+    @classmethod
+    def load(cls, entry: Path) -> Optional['SnapshotInfo']:
+        try:
+            return cls(**json.loads((entry / 'snapshot.json').read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, entry: Path):
+        (entry / 'snapshot.json').write_text(json.dumps(dataclasses.asdict(self)))
+
+
+@dataclasses.dataclass(slots=True)
+class SnapshotReport:
+    files: int
+    # Bytes of the files in the snapshot, and of the ones actually copied.
+    size: int
+    copied: int
+    seconds: float
+
+
+class Snapshots(LruCache):
+    """
+    Copies of the generated project, one folder per name, evicting the least recently used above a total size.
+
+    Contents are stored once in `.objects` by hash, each snapshot folder hard links them under `project`.
+    Objects are copied with reflinks where the filesystem supports them, sharing blocks with the project too.
+    """
+
+    @classmethod
+    def of(cls, vivamir: Vivamir) -> 'Snapshots':
+        return cls(vivamir.root / 'vivamir' / 'snapshots', vivamir.project.snapshot_size * 2 ** 20)
+
+    @property
+    def objects(self) -> Path:
+        return self.folder / '.objects'
+
+    def _object(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def _known(self) -> dict[tuple[str, int, int], str]:
+        """ Digests of the files in other snapshots, by relative path, size and mtime, to avoid hashing them again. """
+
+        known = {}
+        for entry in self._entries():
+            if (info := SnapshotInfo.load(entry)) is None:
+                continue
+            for file, (digest, _, mtime) in info.files.items():
+                with contextlib.suppress(OSError):
+                    known[file, self._object(digest).stat().st_size, mtime] = digest
+        return known
+
+    def save(self, name: str, project: Path, key: str, jobs: Optional[int] = None) -> SnapshotReport:
+        """ Snapshots the project under the name, replacing any previous snapshot with it. """
+
+        start = time.monotonic()
+        self.objects.mkdir(parents=True, exist_ok=True)
+        known = self._known()
+        temporary = Path(tempfile.mkdtemp(prefix='.', dir=self.folder))
+        tree = temporary / 'project'
+        info = SnapshotInfo(fingerprint=key, created=time.time(), files={}, links={}, folders=[])
+
+        files = []
+        for current, folders, names in os.walk(project):
+            relative = Path(current).relative_to(project)
+            info.folders.append(str(relative))
+            (tree / relative).mkdir(exist_ok=True)
+            for child in [*folders, *names]:
+                path = Path(current) / child
+                if path.is_symlink():
+                    info.links[str(relative / child)] = os.readlink(path)
+                elif child in names:
+                    files.append(path)
+
+        def _store(path: Path) -> tuple[str, list, int, int]:
+            file_stat = path.stat()
+            relative = str(path.relative_to(project))
+            digest = known.get((relative, file_stat.st_size, file_stat.st_mtime_ns)) or _digest(path)
+            copied = 0
+            if not (target := self._object(digest)).exists():
+                # Copied aside then linked in, so that equal files stored at once never see a partial object.
+                target.parent.mkdir(exist_ok=True)
+                partial = target.with_name(f'.{digest}.{threading.get_ident()}')
+                _, size = copy_file(path, partial)
+                try:
+                    os.link(partial, target)
+                    copied = size
+                except FileExistsError:
+                    pass
+                finally:
+                    os.unlink(partial)
+            os.link(target, tree / relative)
+            return relative, [digest, stat.S_IMODE(file_stat.st_mode), file_stat.st_mtime_ns], file_stat.st_size, copied
+
+        size = copied = 0
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                for relative, file, file_size, file_copied in pool.map(_store, files):
+                    info.files[relative] = file
+                    size += file_size
+                    copied += file_copied
+            info.save(temporary)
+        except BaseException:
+            shutil.rmtree(temporary, ignore_errors=True)
+            raise
+
+        entry = self.folder / name
+        shutil.rmtree(entry, ignore_errors=True)
+        temporary.replace(entry)
+        self.evict(keep=name)
+        return SnapshotReport(files=len(files), size=size, copied=copied, seconds=time.monotonic() - start)
+
+    def restore(self, name: str, project: Path, key: str, jobs: Optional[int] = None) -> SnapshotReport:
+        """ Turns the project back into the snapshot, only copying the files that differ. """
+
+        start = time.monotonic()
+        if (entry := self.get(name)) is None or (info := SnapshotInfo.load(entry)) is None:
+            raise ValueError(f'No snapshot named {name}.')
+        if info.fingerprint != key:
+            raise ValueError(f'Snapshot {name} was taken with a different project configuration.')
+
+        # Anything not in the snapshot goes, folders last.
+        project.mkdir(parents=True, exist_ok=True)
+        for current, folders, names in os.walk(project, topdown=False):
+            relative = Path(current).relative_to(project)
+            for child in names:
+                if str(relative / child) not in info.files:
+                    os.unlink(Path(current) / child)
+            for child in folders:
+                path = Path(current) / child
+                if path.is_symlink():
+                    os.unlink(path)
+                elif str(relative / child) not in info.folders:
+                    shutil.rmtree(path)
+
+        for folder in info.folders:
+            (project / folder).mkdir(exist_ok=True)
+        for link, target in info.links.items():
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(project / link)
+            os.symlink(target, project / link)
+
+        def _restore(item: tuple[str, list]) -> tuple[int, int]:
+            relative, (digest, mode, mtime) = item
+            path, source = project / relative, self._object(digest)
+            size = source.stat().st_size
+            with contextlib.suppress(FileNotFoundError):
+                current = os.lstat(path)
+                if current.st_size == size and current.st_mtime_ns == mtime and stat.S_ISREG(current.st_mode):
+                    return size, 0
+            # Never written in place, the objects are hard linked to the snapshots.
+            copy_file(source, path)
+            os.chmod(path, mode)
+            os.utime(path, ns=(mtime, mtime))
+            return size, size
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_restore, info.files.items()))
+        return SnapshotReport(files=len(results), size=sum(size for size, _ in results),
+                              copied=sum(copied for _, copied in results), seconds=time.monotonic() - start)
+
+    def remove(self, name: str) -> bool:
+        if (entry := self.get(name)) is None:
+            return False
+        shutil.rmtree(entry)
+        self.collect()
+        return True
+
+    def collect(self) -> int:
+        """ Removes the objects no snapshot links to anymore, returns the bytes freed. """
+
+        freed = 0
+        if not self.objects.is_dir():
+            return freed
+
+        for current, _, files in os.walk(self.objects):
+            for file in files:
+                path = os.path.join(current, file)
+                with contextlib.suppress(OSError):
+                    object_stat = os.stat(path)
+                    if object_stat.st_nlink == 1:
+                        os.unlink(path)
+                        freed += object_stat.st_size
+        return freed
+
+    def size(self) -> int:
+        """ Bytes actually used, each object counted once however many snapshots link it. """
+
+        return sum(os.stat(os.path.join(current, file)).st_size
+                   for current, _, files in os.walk(self.objects) for file in files)
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        removed = 0
+        total = self.size() if self.objects.is_dir() else 0
+        for entry, _, _ in self.entries():
+            if total <= self.max_size:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= self.collect()
+            removed += 1
+        return removed
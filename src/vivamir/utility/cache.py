@@ -0,0 +1,87 @@
+import contextlib
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+
+def _size(folder: Path) -> int:
+    size = 0
+    for current, _, files in os.walk(folder):
+        for file in files:
+            with contextlib.suppress(OSError):
+                size += os.lstat(os.path.join(current, file)).st_size
+    return size
+
+
+class LruCache:
+    """
+    Entries stored as folders named after their key, evicting the least recently used above a total size.
+
+    The mtime of an entry folder is its last use. Entries used within the grace period, in seconds, are never evicted.
+    """
+
+    def __init__(self, folder: Path, max_size: int, grace: float = 0):
+        self.folder = folder
+        self.max_size = max_size
+        self.grace = grace
+
+    def get(self, key: str) -> Optional[Path]:
+        entry = self.folder / key
+        if not entry.is_dir():
+            return None
+
+        with contextlib.suppress(OSError):
+            os.utime(entry)
+        return entry
+
+    def put(self, key: str, files: dict[str, bytes]) -> Path:
+        """ Stores the files as a new entry, replacing any previous one, then evicts old entries. """
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+        temporary = Path(tempfile.mkdtemp(prefix='.', dir=self.folder))
+        for name, data in files.items():
+            (temporary / name).write_bytes(data)
+
+        entry = self.folder / key
+        shutil.rmtree(entry, ignore_errors=True)
+        temporary.replace(entry)
+        self.evict(keep=key)
+        return entry
+
+    def _entries(self) -> list[Path]:
+        return [entry for entry in self.folder.iterdir() if entry.is_dir() and not entry.name.startswith('.')]
+
+    def _last_use(self, entry: Path) -> float:
+        return entry.stat().st_mtime
+
+    def entries(self) -> list[tuple[Path, int, float]]:
+        """ Every entry with its size and last use, least recently used first. """
+
+        if not self.folder.is_dir():
+            return []
+
+        entries = []
+        for entry in self._entries():
+            with contextlib.suppress(OSError):
+                entries.append((entry, _size(entry), self._last_use(entry)))
+        return sorted(entries, key=lambda item: item[2])
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """ Removes the least recently used entries until the cache fits, returns how many were removed. """
+
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        recent = time.time() - self.grace
+        for entry, size, last_use in entries:
+            if total <= self.max_size or last_use > recent:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,66 @@
+import dataclasses
+from typing import Optional
+
+from vivamir.utility.logs import MESSAGE_TEXT_PATTERN
+
+
+@dataclasses.dataclass(slots=True)
+class MessageCount:
+    severity: str
+    total: int = 0
+    hidden: int = 0
+
+
+class FloodControl:
+    """ Shows only the first messages of every severity and ID, periodically summarising how many were hidden. """
+
+    def __init__(self, limit: int, summary_every: int, limits: Optional[dict[str, int]] = None):
+        self.limit = limit
+        self.summary_every = summary_every
+        self.limits = limits or {}
+        self.counts: dict[tuple[str, str], MessageCount] = {}
+        # Whether the lines following a hidden message are hidden with it, until the next message.
+        self._hiding = False
+        self._hiding_all = False
+
+    def _continuation(self, line: str) -> bool:
+        """ Indented lines continue a message, as does anything up to a blank line after one ending with a colon. """
+
+        if self._hiding_all and line.strip():
+            return True
+        self._hiding_all = False
+        return line[:1].isspace() and bool(line.strip())
+
+    def feed(self, line: str) -> Optional[str]:
+        """ Returns the line to print in place of the given one, if any. """
+
+        if (match := MESSAGE_TEXT_PATTERN.match(line)) is None:
+            if self._hiding and self._continuation(line):
+                return None
+            self._hiding = self._hiding_all = False
+            return line
+
+        severity, message_id = match.groups()
+        count = self.counts.setdefault((severity, message_id), MessageCount(severity))
+        count.total += 1
+
+        # Errors are never hidden.
+        self._hiding = self._hiding_all = False
+        if severity == 'ERROR' or count.total <= self.limits.get(message_id, self.limit):
+            return line
+
+        count.hidden += 1
+        self._hiding, self._hiding_all = True, line.rstrip().endswith(':')
+        if count.hidden % self.summary_every == 0:
+            return f'{severity}: (×{count.hidden} more [{message_id}])'
+
+        return None
+
+    def histogram(self) -> list[tuple[str, MessageCount]]:
+        """ Message IDs that were hidden or are at least warnings, most frequent first. """
+
+        return sorted(
+            ((message_id, count) for (_, message_id), count in self.counts.items()
+             if count.hidden > 0 or count.severity != 'INFO'),
+            key=lambda item: (-item[1].total, item[0])
+        )
@@ -0,0 +1,124 @@
+import dataclasses
+import hashlib
+import json
+import subprocess
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+def _git(root: Path, *args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', *args],
+            check=True, capture_output=True, text=True, cwd=root,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def blob_hash(file: Path) -> str:
+    """ Hashes a file the same way `git hash-object` does. """
+
+    data = file.read_bytes()
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+def is_repository(root: Path) -> bool:
+    return _git(root, 'rev-parse', '--is-inside-work-tree') is not None
+
+
+def fingerprints(root: Path, files: Iterable[Path]) -> dict[str, str]:
+    """
+    Content hashes of the given files, keyed by absolute path.
+
+    Tracked files that match the index reuse the hash git already stored, only the others are read.
+    Files that do not exist are left out.
+    """
+
+    files = [str(file) for file in files]
+    result = {}
+
+    # Paths are relative to the root, and separated by NUL so they are never quoted.
+    if (staged := _git(root, 'ls-files', '--stage', '-z', '--', '.')) is not None:
+        changed = _git(root, 'diff-files', '--name-only', '--relative', '-z') or ''
+        modified = set(str(root / file) for file in changed.split('\0') if file)
+        index = {}
+        for entry in staged.split('\0'):
+            if not entry:
+                continue
+            info, path = entry.split('\t', 1)
+            mode, digest, stage = info.split(' ')
+            # Skip submodules and unmerged entries.
+            if mode != '160000' and stage == '0':
+                index[str(root / path)] = digest
+
+        for file in files:
+            if file in index and file not in modified:
+                result[file] = index[file]
+
+    for file in files:
+        if file not in result and Path(file).is_file():
+            result[file] = blob_hash(Path(file))
+
+    return result
+
+
+def dirty(root: Path) -> Optional[list[str]]:
+    """ Uncommitted changes below the root, as `git status --porcelain` lines, or None outside a repository. """
+
+    if (status := _git(root, 'status', '--porcelain', '-z', '--', '.')) is None:
+        return None
+
+    entries = iter(status.split('\0'))
+    lines = []
+    for entry in entries:
+        if not entry:
+            continue
+        # Renames and copies are followed by their source path.
+        if entry[0] in 'RC':
+            next(entries, None)
+        lines.append(entry)
+    return lines
+
+
+@dataclasses.dataclass(slots=True)
+class Changes:
+    added: set[str]
+    removed: set[str]
+    modified: set[str]
+
+    @classmethod
+    def between(cls, before: dict[str, str], after: dict[str, str]) -> 'Changes':
+        return cls(
+            added=after.keys() - before.keys(),
+            removed=before.keys() - after.keys(),
+            modified=set(file for file in after.keys() & before.keys() if before[file] != after[file]),
+        )
+
+    def all(self) -> set[str]:
+        return self.added | self.removed | self.modified
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+class Baseline:
+    """ Fingerprints stored on disk, to find what changed since they were taken. """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def load(self) -> dict[str, str]:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, fingerprints: dict[str, str]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(fingerprints))
+        temporary.replace(self.path)
+
+    def changes(self, fingerprints: dict[str, str]) -> Changes:
+        return Changes.between(self.load(), fingerprints)
@@ -0,0 +1,321 @@
+import dataclasses
+import re
+from pathlib import Path
+from typing import Iterable, Optional
+
+VERILOG_EXTENSIONS = ('.v', '.vh', '.sv', '.svh')
+VHDL_EXTENSIONS = ('.vhdl',)
+# Only included by other files, never compiled on their own.
+HEADER_EXTENSIONS = ('.vh', '.svh')
+
+# Comments and strings, strings are matched so that comment markers inside them are ignored.
+_VERILOG_SKIP = re.compile(r'//[^\n]*|/\*.*?(?:\*/|\Z)|"(?:\\.|[^"\\\n])*"', re.DOTALL)
+_VHDL_SKIP = re.compile(r'--[^\n]*|/\*.*?(?:\*/|\Z)|"(?:[^"\n]|"")*"', re.DOTALL)
+
+_VERILOG_INCLUDE = re.compile(r'`include\s+"([^"]+)"')
+_VERILOG_DEFINE = re.compile(r'`define\s+(\w+)')
+_VERILOG_DECLARATION = re.compile(
+    r'^[ \t]*(?:(?:virtual|extern)\s+)?(module|macromodule|interface|program|package|primitive|checker)'
+    r'\s+(?:(?:static|automatic)\s+)?(\w+)', re.MULTILINE)
+_VERILOG_SCOPE = re.compile(r'\b(\w+)\s*::')
+
+_VHDL_DECLARATION = re.compile(r'^[ \t]*(entity|package)\s+(?!body\b)(\w+)\s+is\b', re.MULTILINE | re.IGNORECASE)
+_VHDL_WORK = re.compile(r'\bwork\s*\.\s*(\w+)', re.IGNORECASE)
+
+
+def language(path: Path) -> Optional[str]:
+    if path.suffix in VERILOG_EXTENSIONS:
+        return 'verilog'
+    if path.suffix in VHDL_EXTENSIONS:
+        return 'vhdl'
+    return None
+
+
+def strip(text: str, vhdl: bool = False, strings: bool = True) -> str:
+    """ Blanks comments, and the content of strings unless kept, keeping the line of everything else. """
+
+    def _blank(match: re.Match) -> str:
+        if match[0].startswith('"'):
+            return match[0] if strings else '""'
+        return '\n' * match[0].count('\n')
+
+    return (_VHDL_SKIP if vhdl else _VERILOG_SKIP).sub(_blank, text)
+
+
+def line_of(text: str, offset: int) -> int:
+    return text.count('\n', 0, offset) + 1
+
+
+@dataclasses.dataclass(slots=True)
+class Source:
+    """ What a source file declares and needs, as found by a lightweight scan. """
+
+    path: Path
+    language: str
+    # Design units declared, modules, interfaces, packages, entities...
+    units: set[str]
+    packages: set[str]
+    # Names used as packages or library units, which must be compiled first.
+    references: set[str]
+    # Included name and line.
+    includes: list[tuple[str, int]]
+    # Macros defined with `define, which later files compiled in the same call see.
+    macros: set[str]
+
+    @classmethod
+    def scan(cls, path: Path, text: Optional[str] = None) -> 'Source':
+        text = path.read_text(errors='replace') if text is None else text
+        kind = language(path)
+
+        if kind == 'vhdl':
+            text = strip(text, vhdl=True, strings=False)
+            declarations = [(match[1].lower(), match[2].lower()) for match in _VHDL_DECLARATION.finditer(text)]
+            return cls(
+                path=path, language=kind,
+                units=set(name for _, name in declarations),
+                packages=set(name for unit, name in declarations if unit == 'package'),
+                references=set(match[1].lower() for match in _VHDL_WORK.finditer(text)),
+                includes=[],
+                macros=set(),
+            )
+
+        code = strip(text, strings=False)
+        declarations = [(match[1], match[2]) for match in _VERILOG_DECLARATION.finditer(code)]
+        text = strip(text)
+        return cls(
+            path=path, language='verilog',
+            units=set(name for _, name in declarations),
+            packages=set(name for unit, name in declarations if unit == 'package'),
+            references=set(match[1] for match in _VERILOG_SCOPE.finditer(code)),
+            includes=[(match[1], line_of(text, match.start())) for match in _VERILOG_INCLUDE.finditer(text)],
+            macros=set(match[1] for match in _VERILOG_DEFINE.finditer(text)),
+        )
+
+
+def resolve_include(name: str, source: Path, include_dirs: Iterable[Path]) -> Optional[Path]:
+    """ Finds an included file next to the source first, then in the include folders, like xvlog does. """
+
+    for folder in [source.parent, *include_dirs]:
+        if (candidate := folder / name).is_file():
+            return candidate
+    return None
+
+
+@dataclasses.dataclass(slots=True)
+class Token:
+    kind: str
+    text: str
+    line: int
+
+
+_VERILOG_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<unterminated_comment>/\*)
+  | (?P<string>"(?:\\.|[^"\\\n])*")
+  | (?P<unterminated_string>")
+  | (?P<directive>`[A-Za-z_]\w*)
+  | (?P<system>\$[\w$]*)
+  | (?P<escaped>\\\S+)
+  | (?P<number>'[sS]?[bBoOdDhH]\s*[\w?]+|'[01xXzZ]\b|\d[\d_]*(?:\.\d[\d_]*)?(?:[eE][+-]?\d+)?)
+  | (?P<identifier>[A-Za-z_][\w$]*)
+  | (?P<punctuation>[()\[\]{}])
+  | (?P<operator>[-+*/%=!<>&|^~?:;,.\#@'])
+  | (?P<invalid>.)
+''', re.VERBOSE | re.DOTALL)
+
+_VHDL_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<unterminated_comment>/\*)
+  | (?P<string>"(?:[^"\n]|"")*")
+  | (?P<unterminated_string>")
+  | (?P<character>'.')
+  | (?P<escaped>\\(?:[^\\\n]|\\\\)*\\)
+  | (?P<number>\d[\d_]*\#[\w.]+\#|\d[\d_]*(?:\.\d[\d_]*)?(?:[eE][+-]?\d+)?)
+  | (?P<identifier>[A-Za-z][\w]*)
+  | (?P<punctuation>[()\[\]])
+  | (?P<operator>[-+*/&=<>|:;,.'?@])
+  | (?P<invalid>.)
+''', re.VERBOSE | re.DOTALL)
+
+# Reserved words after which a tick starts a character literal, as in `when '(' =>`, rather than an attribute.
+_VHDL_RESERVED = frozenset('''
+    abs access after alias all and architecture array assert assume attribute begin block body buffer bus case
+    component configuration constant context cover default disconnect downto else elsif end entity exit fairness
+    file for force function generate generic group guarded if impure in inertial inout is label library linkage
+    literal loop map mod nand new next nor not null of on open or others out package parameter port postponed
+    procedure process property protected pure range record register reject release rem report restrict return rol
+    ror select sequence severity shared signal sla sll sra srl strong subtype then to transport type unaffected
+    units until use variable vmode vprop vunit wait when while with xnor xor
+'''.split())
+
+# The rest of a `define, including lines continued by a backslash.
+_VERILOG_DEFINE_BODY = re.compile(r'(?:[^\n\\]|\\.|\\\n)*', re.DOTALL)
+
+
+def tokenize(text: str, vhdl: bool = False) -> tuple[list[Token], list[tuple[int, str]]]:
+    """ Significant tokens and lexical errors as (line, message), comments and `define bodies are skipped. """
+
+    pattern = _VHDL_TOKEN if vhdl else _VERILOG_TOKEN
+    tokens, errors = [], []
+    position, line = 0, 1
+    while position < len(text):
+        match = pattern.match(text, position)
+        kind, value = match.lastgroup, match[0]
+
+        # In VHDL a tick after a name or a closing parenthesis is an attribute, not a character literal.
+        if kind == 'character' and tokens and (tokens[-1].text == ')' or tokens[-1].kind == 'identifier'
+                                               and tokens[-1].text.lower() not in _VHDL_RESERVED):
+            kind, value = 'operator', "'"
+
+        if kind == 'unterminated_comment':
+            errors.append((line, 'Block comment is never closed.'))
+            break
+        if kind == 'unterminated_string':
+            errors.append((line, 'String is not closed on the same line.'))
+        elif kind == 'invalid':
+            errors.append((line, f'Unexpected character {value!r}.'))
+        elif kind not in ('space', 'comment'):
+            tokens.append(Token(kind, value, line))
+
+        position += len(value)
+        line += value.count('\n')
+
+        if kind == 'directive' and value == '`define':
+            body = _VERILOG_DEFINE_BODY.match(text, position)[0]
+            position += len(body)
+            line += body.count('\n')
+
+    return tokens, errors
+
+
+# Keywords opening a block, to the keywords closing it.
+_VERILOG_BLOCKS = {
+    'module': {'endmodule'}, 'macromodule': {'endmodule'}, 'primitive': {'endprimitive'},
+    'function': {'endfunction'}, 'task': {'endtask'}, 'begin': {'end'}, 'fork': {'join', 'join_any', 'join_none'},
+    'case': {'endcase'}, 'casex': {'endcase'}, 'casez': {'endcase'}, 'generate': {'endgenerate'},
+    'table': {'endtable'}, 'specify': {'endspecify'},
+}
+_SYSTEM_VERILOG_BLOCKS = {
+    **_VERILOG_BLOCKS,
+    'interface': {'endinterface'}, 'program': {'endprogram'}, 'package': {'endpackage'}, 'class': {'endclass'},
+    'randcase': {'endcase'}, 'covergroup': {'endgroup'}, 'property': {'endproperty'}, 'sequence': {'endsequence'},
+    'randsequence': {'endsequence'},
+}
+_BRACKETS = {'(': {')'}, '[': {']'}, '{': {'}'}}
+# Openers which only declare or refer to something without a body, when preceded by these.
+_NO_BODY = {
+    'function': {'extern', 'pure', 'import', 'export', 'with'}, 'task': {'extern', 'pure', 'import', 'export'},
+    'module': {'extern'}, 'class': {'typedef'}, 'interface': {'virtual', 'typedef'},
+    'fork': {'wait', 'disable'},
+    'property': {'assert', 'assume', 'cover', 'restrict', 'expect'},
+    'sequence': {'assert', 'assume', 'cover', 'restrict', 'expect'},
+}
+
+
+# Tokens ending the statement before an opener, as blocks close without a semicolon.
+_STATEMENT_END = {';', '}', 'begin', *(closer for closing in _SYSTEM_VERILOG_BLOCKS.values() for closer in closing)}
+
+
+def _has_body(tokens: list[Token], index: int) -> bool:
+    keyword = tokens[index].text
+    if keyword == 'interface' and index + 1 < len(tokens) and tokens[index + 1].text == 'class':
+        return False
+
+    # Qualifiers like `extern static protected virtual` or `import "DPI-C" context c_f =` come first in the
+    # same statement, however many there are.
+    for previous in reversed(tokens[:index]):
+        if previous.text in _STATEMENT_END or previous.kind == 'directive':
+            break
+        if previous.text in _NO_BODY.get(keyword, ()):
+            return False
+    return True
+
+
+def check_structure(tokens: list[Token], system_verilog: bool) -> list[tuple[int, str]]:
+    """ Checks that blocks and brackets are closed in order, reporting the first mismatch only. """
+
+    blocks = _SYSTEM_VERILOG_BLOCKS if system_verilog else _VERILOG_BLOCKS
+    closers = {closer: opener for opener, closing in {**blocks, **_BRACKETS}.items() for closer in closing}
+    stack: list[Token] = []
+    # Branches after the first of every `ifdef are skipped, each is expected to be balanced on its own.
+    conditions: list[bool] = []
+
+    for index, token in enumerate(tokens):
+        if token.kind == 'directive':
+            if token.text in ('`ifdef', '`ifndef'):
+                conditions.append(True)
+            elif token.text in ('`elsif', '`else'):
+                if not conditions:
+                    return [(token.line, f'{token.text} without `ifdef.')]
+                conditions[-1] = False
+            elif token.text == '`endif':
+                if not conditions:
+                    return [(token.line, '`endif without `ifdef.')]
+                conditions.pop()
+            continue
+
+        if not all(conditions) or token.kind not in ('identifier', 'punctuation'):
+            continue
+
+        if token.text in blocks or token.text in _BRACKETS:
+            if token.kind == 'punctuation' or _has_body(tokens, index):
+                stack.append(token)
+        elif token.text in closers:
+            if not stack:
+                return [(token.line, f'Unexpected `{token.text}`, nothing is open.')]
+            opener = stack.pop()
+            if token.text not in {**blocks, **_BRACKETS}[opener.text]:
+                return [(token.line, f'Unexpected `{token.text}`, `{opener.text}` '
+                                     f'opened at line {opener.line} is still open.')]
+
+    if conditions:
+        return [(tokens[-1].line if tokens else 1, '`ifdef is never closed by `endif.')]
+    if stack:
+        return [(stack[-1].line, f'`{stack[-1].text}` is never closed.')]
+    return []
+
+
+def check_brackets(tokens: list[Token]) -> list[tuple[int, str]]:
+    stack: list[Token] = []
+    for token in tokens:
+        if token.kind != 'punctuation':
+            continue
+        if token.text in _BRACKETS:
+            stack.append(token)
+        elif not stack:
+            return [(token.line, f'Unexpected `{token.text}`, nothing is open.')]
+        elif token.text not in _BRACKETS[(opener := stack.pop()).text]:
+            return [(token.line, f'Unexpected `{token.text}`, `{opener.text}` '
+                                 f'opened at line {opener.line} is still open.')]
+    if stack:
+        return [(stack[-1].line, f'`{stack[-1].text}` is never closed.')]
+    return []
+
+
+def check(path: str) -> dict:
+    """
+    Scans and syntax checks a source, returning plain data so it can run in another process.
+
+    Lexical errors are reported as (line, message). Unbalanced blocks and brackets are only warnings,
+    as the check does not know every construct the compiler accepts.
+    """
+
+    file = Path(path)
+    # Editors on Windows may start files with a byte order mark, which the tools skip.
+    text = file.read_text(errors='replace').removeprefix('\ufeff')
+    source = Source.scan(file, text)
+
+    vhdl = source.language == 'vhdl'
+    tokens, errors = tokenize(text, vhdl=vhdl)
+    warnings = []
+    if not errors:
+        warnings = check_brackets(tokens) if vhdl else check_structure(tokens, file.suffix in ('.sv', '.svh'))
+
+    return {
+        'units': sorted(source.units),
+        'includes': source.includes,
+        'errors': errors,
+        'warnings': warnings,
+    }
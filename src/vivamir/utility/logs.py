@@ -0,0 +1,201 @@
+import array
+import contextlib
+import dataclasses
+import fnmatch
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+# Matches the start of every Vivado message, as in `WARNING: [Synth 8-3331] design ...`.
+MESSAGE_PATTERN = re.compile(rb'^(INFO|WARNING|CRITICAL WARNING|ERROR): \[([^\]]+)\]', re.MULTILINE)
+MESSAGE_TEXT_PATTERN = re.compile(MESSAGE_PATTERN.pattern.decode())
+SEVERITIES = ('INFO', 'WARNING', 'CRITICAL WARNING', 'ERROR')
+
+
+class LogFollower:
+    """ Follows a log file like `tail -F` would, reopening it when rotated or truncated. """
+
+    def __init__(self, path: Path, from_end: bool = True, interval: float = 0.2):
+        self.path = path
+        self.from_end = from_end
+        self.interval = interval
+        self._file = None
+        self._identity = None
+        self._partial = b''
+        self._stop = threading.Event()
+
+    def _open(self, from_end: bool) -> bool:
+        try:
+            file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return False
+
+        stat = os.fstat(file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        if from_end:
+            file.seek(0, os.SEEK_END)
+        self._file = file
+        return True
+
+    def _rotated(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self._identity or stat.st_size < self._file.tell()
+
+    def poll(self) -> list[str]:
+        """ Returns the complete lines written since the last call. """
+
+        if self._file is None:
+            # Only the first opening skips existing content, later files are new.
+            if not self._open(self.from_end):
+                return []
+            self.from_end = False
+
+        data = self._partial + self._file.read()
+        if self._rotated():
+            # Drain the old file, then start from the beginning of the new one.
+            data += self._file.read()
+            self._file.close()
+            self._file = None
+            if not self._open(from_end=False):
+                return []
+            data += b'\n' if data and not data.endswith(b'\n') else b''
+            data += self._file.read()
+
+        *lines, self._partial = data.split(b'\n')
+        return [line.decode(errors='replace') for line in lines]
+
+    def close(self):
+        self._stop.set()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @contextlib.contextmanager
+    def following(self, callback: Callable[[str], None]):
+        """ Calls back with every new line from a background thread, until the context exits. """
+
+        # Positioned now rather than on the first poll, lines written meanwhile would be skipped.
+        # A log created later is all new.
+        if self._file is None:
+            self._open(self.from_end)
+            self.from_end = False
+
+        def _follow():
+            while not self._stop.wait(self.interval):
+                for line in self.poll():
+                    callback(line)
+            for line in self.poll():
+                callback(line)
+
+        thread = threading.Thread(target=_follow, name=f'follow {self.path.name}', daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            self._stop.set()
+            thread.join()
+            self.close()
+
+
+@dataclasses.dataclass(slots=True)
+class LogIndex:
+    """
+    Offsets of every message in a log, grouped by severity and ID, updated incrementally.
+
+    Offsets are appended to a binary file per group, so queries only read the groups they match.
+    """
+
+    folder: Path
+    # Device and inode of the indexed log, a different file is indexed from scratch.
+    identity: list[int]
+    # Bytes indexed so far, always at the end of a complete line.
+    indexed: int
+    # `SEVERITY\tID` to the number of offsets stored for it.
+    counts: dict[str, int]
+
+    @staticmethod
+    def _group(key: str) -> str:
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    @classmethod
+    def load(cls, log: Path, cache: Path) -> 'LogIndex':
+        """ Loads the index of the log, indexing only what was appended since the last call. """
+
+        folder = cache / 'logs' / log.name
+        stat = log.stat()
+        identity = [stat.st_dev, stat.st_ino]
+
+        index = None
+        with contextlib.suppress(OSError, ValueError, TypeError):
+            index = cls(folder=folder, **json.loads((folder / 'index.json').read_text()))
+
+        if index is None or index.identity != identity or index.indexed > stat.st_size:
+            shutil.rmtree(folder, ignore_errors=True)
+            index = cls(folder=folder, identity=identity, indexed=0, counts={})
+
+        if index.indexed < stat.st_size:
+            index.update(log)
+
+        return index
+
+    def update(self, log: Path):
+        with open(log, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = data.rfind(b'\n', self.indexed) + 1
+            if end <= self.indexed:
+                return
+
+            offsets: dict[str, array.array] = {}
+            for match in MESSAGE_PATTERN.finditer(data, self.indexed, end):
+                key = f'{match[1].decode()}\t{match[2].decode(errors="replace")}'
+                offsets.setdefault(key, array.array('Q')).append(match.start())
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+        for key, group in offsets.items():
+            with open(self.folder / self._group(key), 'ab') as file:
+                # Drop offsets past the count, left behind by an interrupted update.
+                file.truncate(self.counts.get(key, 0) * group.itemsize)
+                group.tofile(file)
+            self.counts[key] = self.counts.get(key, 0) + len(group)
+
+        self.indexed = end
+        temporary = self.folder / 'index.tmp'
+        temporary.write_text(json.dumps({'identity': self.identity, 'indexed': self.indexed, 'counts': self.counts}))
+        temporary.replace(self.folder / 'index.json')
+
+    def keys(self, message_id: Optional[str] = None, severity: Optional[str] = None) -> list[tuple[str, str]]:
+        """ Severity and ID pairs matching the filters, IDs can use shell wildcards. """
+
+        keys = [tuple(key.split('\t', 1)) for key in self.counts]
+        return sorted(
+            (key_severity, key_id) for key_severity, key_id in keys
+            if (severity is None or key_severity == severity.upper())
+            and (message_id is None or fnmatch.fnmatchcase(key_id, message_id))
+        )
+
+    def offsets(self, severity: str, message_id: str) -> array.array:
+        key = f'{severity}\t{message_id}'
+        group = array.array('Q')
+        with open(self.folder / self._group(key), 'rb') as file:
+            group.fromfile(file, self.counts[key])
+        return group
+
+    def query(self, log: Path, message_id: Optional[str] = None, severity: Optional[str] = None) -> Iterator[str]:
+        """ Yields the first line of every matching message, in log order. """
+
+        groups = [self.offsets(*key) for key in self.keys(message_id, severity)]
+        if not groups:
+            return
+
+        with open(log, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset in heapq.merge(*groups):
+                yield data[offset:data.find(b'\n', offset)].decode(errors='replace')
@@ -1,4 +1,17 @@
+import os
 from pathlib import Path
 
 ROOT = Path(__file__).parents[3]
 DEFAULT = ROOT / 'default'
+
+
+def user_cache() -> Path:
+    """ Folder for caches shared by every project of the user, following the XDG base directories. """
+
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'vivamir'
+
+
+def user_config() -> Path:
+    """ Folder for settings shared by every project of the user, following the XDG base directories. """
+
+    return Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config') / 'vivamir'
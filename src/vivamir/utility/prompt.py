@@ -4,12 +4,17 @@ from rich import print
 import typer
 
 
-def prompt_until_valid[T](prompt: str, validate: Callable[[str], Optional[T]], default: str = None) -> T:
+def prompt_until_valid[T](prompt: str, validate: Callable[[str], Optional[T]], default: str = None,
+                          overridable: bool = False) -> T:
+    """ Prompts until the value is valid, or until it is confirmed anyway when overridable. """
+
     try:
         while True:
             value = typer.prompt(prompt, default)
 
-            if (value := validate(value)) is not None:
+            if (valid := validate(value)) is not None:
+                return valid
+            if overridable and typer.confirm(f'Use {value} anyway?', default=False):
                 return value
     except KeyboardInterrupt:
         print('[red]Aborted.')
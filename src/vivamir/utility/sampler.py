@@ -0,0 +1,194 @@
+import contextlib
+import csv
+import dataclasses
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from rich import print
+
+from vivamir.utility.units import format_size
+
+_PROC = Path('/proc')
+# Sample files kept in the runs folder, the oldest are removed first.
+KEPT_RUNS = 100
+
+
+@dataclasses.dataclass(slots=True)
+class Sample:
+    time: float
+    # Percent of a single core, summed over the process tree.
+    cpu: float
+    rss: int
+    read: int
+    write: int
+    processes: int
+    phase: str
+
+
+class ResourceSampler:
+    """ Samples CPU, memory and I/O of a process and its children from /proc, at a fixed interval. """
+
+    def __init__(self, pid: int, interval: float, record: Optional[Path] = None):
+        self.pid = pid
+        self.interval = interval
+        self.record = record
+        self.samples: list[Sample] = []
+        # Updated by whoever reads the output, to correlate samples with Vivado's phases.
+        self.phase = ''
+        self._thread = None
+        self._ticks: dict[int, int] = {}
+        self._last = time.monotonic()
+        self._stop = threading.Event()
+        self._tick = os.sysconf('SC_CLK_TCK')
+        self._page = os.sysconf('SC_PAGE_SIZE')
+
+    @staticmethod
+    def available() -> bool:
+        return (_PROC / 'self' / 'stat').exists()
+
+    def _tree(self) -> dict[int, list[str]]:
+        """ Stat fields, after the command name, of every process in the tree. """
+
+        stats, children = {}, {}
+        for entry in os.scandir(_PROC):
+            if not entry.name.isdigit():
+                continue
+            with contextlib.suppress(OSError):
+                fields = (_PROC / entry.name / 'stat').read_text().rsplit(')', 1)[1].split()
+                stats[int(entry.name)] = fields
+                children.setdefault(int(fields[1]), []).append(int(entry.name))
+
+        tree, pending = {}, [self.pid]
+        while pending:
+            pid = pending.pop()
+            if pid in stats:
+                tree[pid] = stats[pid]
+                pending.extend(children.get(pid, []))
+        return tree
+
+    def baseline(self):
+        """ Reads the current CPU ticks, so that the first sample only counts what was used since. """
+
+        for pid, fields in self._tree().items():
+            self._ticks[pid] = int(fields[11]) + int(fields[12])
+        self._last = time.monotonic()
+
+    def sample(self) -> Optional[Sample]:
+        tree = self._tree()
+        if not tree:
+            return None
+
+        now = time.monotonic()
+        elapsed, self._last = now - self._last, now
+
+        cpu = rss = read = write = 0
+        for pid, fields in tree.items():
+            ticks = int(fields[11]) + int(fields[12])
+            cpu += max(0, ticks - self._ticks.get(pid, 0))
+            self._ticks[pid] = ticks
+            rss += int(fields[21]) * self._page
+
+            with contextlib.suppress(OSError):
+                io = dict(line.split(': ') for line in (_PROC / str(pid) / 'io').read_text().splitlines())
+                read += int(io['read_bytes'])
+                write += int(io['write_bytes'])
+
+        sample = Sample(
+            time=time.time(), cpu=100 * cpu / self._tick / max(elapsed, 1e-3),
+            rss=rss, read=read, write=write, processes=len(tree), phase=self.phase,
+        )
+        self.samples.append(sample)
+        return sample
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self) -> 'ResourceSampler':
+        self.baseline()
+        self._thread = threading.Thread(target=self._run, name=f'sample {self.pid}', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self._stop.set()
+        self._thread.join()
+        self.save()
+        self.print_summary()
+
+    def save(self):
+        if self.record is None or not self.samples:
+            return
+
+        self.record.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.record, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow([field.name for field in dataclasses.fields(Sample)])
+            for sample in self.samples:
+                writer.writerow([f'{sample.time:.3f}', f'{sample.cpu:.1f}', sample.rss,
+                                 sample.read, sample.write, sample.processes, sample.phase])
+        prune_runs(self.record.parent)
+
+    def print_summary(self):
+        if not self.samples:
+            return
+
+        cpu = [sample.cpu for sample in self.samples]
+        rss = [sample.rss for sample in self.samples]
+        # Counters of exited processes are lost, the largest totals are the best estimate.
+        read = max(sample.read for sample in self.samples)
+        write = max(sample.write for sample in self.samples)
+
+        print(
+            f'INFO: [Vivamir] Resources over {len(self.samples)} samples: '
+            f'CPU peak {max(cpu):.0f}% mean {sum(cpu) / len(cpu):.0f}%, '
+            f'RSS peak {format_size(max(rss))} mean {format_size(sum(rss) / len(rss))}, '
+            f'read {format_size(read)}, written {format_size(write)}, '
+            f'{max(sample.processes for sample in self.samples)} processes at most.'
+        )
+        if self.record is not None:
+            print(f'INFO: [Vivamir] Samples saved to {self.record!s}')
+
+
+def run_record(vivamir_folder: Path, command: str) -> Path:
+    """ Where to save the samples of a run, named after the time and command. """
+
+    return vivamir_folder / 'runs' / f'{time.strftime("%Y%m%d-%H%M%S")}-{command}.csv'
+
+
+def prune_runs(folder: Path, keep: int = KEPT_RUNS):
+    """ Removes the oldest sample files, named after their time, beyond the most recent ones. """
+
+    for record in sorted(folder.glob('*.csv'))[:-keep]:
+        record.unlink(missing_ok=True)
+
+
+@contextlib.contextmanager
+def sampling(process: subprocess.Popen, interval: float, record: Optional[Path]):
+    """ Samples the process while the context is active, when enabled and supported. """
+
+    if interval <= 0 or not ResourceSampler.available():
+        yield None
+        return
+
+    with ResourceSampler(process.pid, interval, record) as sampler:
+        yield sampler
+
+
+def run_sampled(args: list[str], cwd: Path, interval: float, command: str):
+    """ Like `subprocess.run(args, cwd=cwd, check=True)`, sampling the resources used meanwhile. """
+
+    process = subprocess.Popen(args, cwd=cwd)
+    with sampling(process, interval, run_record(cwd, command)):
+        try:
+            code = process.wait()
+        except KeyboardInterrupt:
+            process.kill()
+            raise
+
+    if code != 0:
+        raise subprocess.CalledProcessError(code, args)
@@ -0,0 +1,179 @@
+import collections
+import contextlib
+import dataclasses
+import errno
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# From linux/fs.h, shares the extents of a file on copy-on-write filesystems like Btrfs and XFS.
+_FICLONE = 0x40049409
+# Errors meaning the filesystem cannot do it, not that the copy failed.
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY, errno.EBADF}
+
+REFLINK = 'reflink'
+COPY_FILE_RANGE = 'copy_file_range'
+SENDFILE = 'sendfile'
+BUFFERED = 'buffered'
+
+
+class _Support:
+    """ Copy methods found unsupported, per device, so they are not attempted for every file. """
+
+    def __init__(self):
+        self._unsupported: set[tuple[int, str]] = set()
+        self._lock = threading.Lock()
+
+    def supported(self, device: int, method: str) -> bool:
+        return (device, method) not in self._unsupported
+
+    def unsupported(self, device: int, method: str):
+        with self._lock:
+            self._unsupported.add((device, method))
+
+
+def _copy_data(source: int, destination: int, size: int, device: int, support: _Support) -> str:
+    if fcntl is not None and support.supported(device, REFLINK):
+        try:
+            fcntl.ioctl(destination, _FICLONE, source)
+            return REFLINK
+        except OSError as error:
+            if error.errno not in _UNSUPPORTED:
+                raise
+            support.unsupported(device, REFLINK)
+
+    if hasattr(os, 'copy_file_range') and support.supported(device, COPY_FILE_RANGE):
+        try:
+            copied = 0
+            while copied < size:
+                if (count := os.copy_file_range(source, destination, size - copied)) == 0:
+                    break
+                copied += count
+            return COPY_FILE_RANGE
+        except OSError as error:
+            if error.errno not in _UNSUPPORTED:
+                raise
+            support.unsupported(device, COPY_FILE_RANGE)
+            os.lseek(source, 0, os.SEEK_SET)
+            os.lseek(destination, 0, os.SEEK_SET)
+            os.ftruncate(destination, 0)
+
+    # Still copied by the kernel, for Pythons built without copy_file_range.
+    if hasattr(os, 'sendfile') and support.supported(device, SENDFILE):
+        try:
+            copied = 0
+            while copied < size:
+                if (count := os.sendfile(destination, source, copied, size - copied)) == 0:
+                    break
+                copied += count
+            return SENDFILE
+        except OSError as error:
+            if error.errno not in _UNSUPPORTED:
+                raise
+            support.unsupported(device, SENDFILE)
+            os.lseek(destination, 0, os.SEEK_SET)
+            os.ftruncate(destination, 0)
+
+    with open(source, 'rb', closefd=False) as reader, open(destination, 'wb', closefd=False) as writer:
+        shutil.copyfileobj(reader, writer, 1 << 20)
+    return BUFFERED
+
+
+def copy_file(source: Path, destination: Path, support: Optional[_Support] = None) -> tuple[str, int]:
+    """
+    Copies a file keeping its mode and times, returning the method used and the bytes copied.
+
+    An existing destination is replaced by a copy written next to it, so files hard linked to it are
+    never modified.
+    """
+
+    support = support or _Support()
+    source_fd = os.open(source, os.O_RDONLY)
+    temporary = None
+    try:
+        stat = os.fstat(source_fd)
+        flags, mode = os.O_WRONLY | os.O_CREAT | os.O_EXCL, stat.st_mode & 0o7777
+        try:
+            destination_fd = os.open(destination, flags, mode)
+        except FileExistsError:
+            temporary = destination.with_name(f'.{destination.name}.vivamir')
+            destination_fd = os.open(temporary, flags & ~os.O_EXCL | os.O_TRUNC, mode)
+        try:
+            method = _copy_data(source_fd, destination_fd, stat.st_size, stat.st_dev, support)
+            os.utime(destination_fd, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        finally:
+            os.close(destination_fd)
+        if temporary is not None:
+            os.replace(temporary, destination)
+        return method, stat.st_size
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temporary or destination)
+        raise
+    finally:
+        os.close(source_fd)
+
+
+def _unchanged(source: Path, destination: Path) -> bool:
+    try:
+        before, after = os.stat(source), os.stat(destination)
+    except FileNotFoundError:
+        return False
+    return before.st_size == after.st_size and before.st_mtime_ns == after.st_mtime_ns
+
+
+@dataclasses.dataclass(slots=True)
+class TransferReport:
+    # Method to the number of files copied with it.
+    copied: dict[str, int]
+    unchanged: int
+    bytes: int
+
+    def __str__(self) -> str:
+        methods = ', '.join(f'{count} by {method}' for method, count in sorted(self.copied.items()))
+        return (f'{sum(self.copied.values())} files copied{f" ({methods})" if methods else ""}, '
+                f'{self.unchanged} unchanged')
+
+
+def transfer(pairs: Iterable[tuple[Path, Path]], jobs: Optional[int] = None) -> TransferReport:
+    """
+    Copies every source to its destination on a thread pool, skipping files with the same size and mtime.
+
+    Times are preserved, so transferring the same files again only compares metadata.
+    """
+
+    pairs = list(pairs)
+    for folder in set(destination.parent for _, destination in pairs):
+        folder.mkdir(parents=True, exist_ok=True)
+
+    support = _Support()
+    report = TransferReport(copied=collections.Counter(), unchanged=0, bytes=0)
+    lock = threading.Lock()
+
+    def _transfer(source: Path, destination: Path):
+        if _unchanged(source, destination):
+            method, size = None, 0
+        else:
+            method, size = copy_file(source, destination, support)
+        with lock:
+            if method is None:
+                report.unchanged += 1
+            else:
+                report.copied[method] += 1
+                report.bytes += size
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # Consume the results, raising the first error.
+        for _ in pool.map(lambda pair: _transfer(*pair), pairs):
+            pass
+
+    report.copied = dict(report.copied)
+    return report
@@ -0,0 +1,6 @@
+def format_size(value: float) -> str:
+    for unit in ['B', 'KiB', 'MiB', 'GiB']:
+        if value < 1024:
+            return f'{value:.1f} {unit}'
+        value /= 1024
+    return f'{value:.1f} TiB'
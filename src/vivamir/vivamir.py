@@ -1,11 +1,12 @@
 import dataclasses
 import functools
+import os
 import subprocess
 import tomllib
 from decimal import Decimal
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import dacite
 from vivamir.utility.version import SemanticVersion
@@ -144,31 +145,109 @@ class Vivado:
     properties: Optional[list[VivadoProperty]]
 
 
+@dataclasses.dataclass(slots=True)
+class Project:
+    link: bool = dataclasses.field(default=False)
+    # Off unless asked for, the cache is shared with every other project of the user.
+    ip_cache: bool = dataclasses.field(default=False)
+    # MiB of project snapshots to keep.
+    snapshot_size: int = dataclasses.field(default=16384)
+    # Parallel Vivado runs, 0 for one per core.
+    jobs: int = dataclasses.field(default=0)
+
+
+@dataclasses.dataclass(slots=True)
+class Messages:
+    limit: int = dataclasses.field(default=20)
+    summary_every: int = dataclasses.field(default=1000)
+    limits: dict[str, int] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass(slots=True)
+class Simulation:
+    # MiB of cached simulation results to keep.
+    cache_size: int = dataclasses.field(default=64)
+
+
+# Sections needing files or subprocesses to be resolved, stored as parsed under an underscore until first read.
+_LAZY = ('ignore', 'filesets', 'includes', 'block_designs', 'remotes')
+
+
 @dataclasses.dataclass(slots=True)
 class Vivamir:
     root: Path = dataclasses.field(init=False)
     version: SemanticVersion
     name: str
-    ignore: Optional[Ignore]
+    _ignore: Optional[Ignore]
     design_top: str
     simulation_top: str
-    filesets: list[Fileset]
-    includes: list[Include]
-    block_designs: BlockDesigns
+    _filesets: list[Fileset]
+    _includes: list[Include]
+    _block_designs: BlockDesigns
     ips: IPs
-    remotes: Remote
+    _remotes: Remote
     vivado: Vivado
+    project: Project = dataclasses.field(default_factory=Project)
+    messages: Messages = dataclasses.field(default_factory=Messages)
+    simulation: Simulation = dataclasses.field(default_factory=Simulation)
+    # Sections resolved so far, see `_lazy`.
+    _resolved: set[str] = dataclasses.field(init=False, default_factory=set, repr=False, compare=False)
+
+    def _lazy[T](self, name: str, resolve: Callable[[T], T]) -> T:
+        """ Resolves a section the first time it is read, errors are raised again on every read until it resolves. """
+
+        value = getattr(self, f'_{name}')
+        if name not in self._resolved:
+            value = resolve(value)
+            setattr(self, f'_{name}', value)
+            self._resolved.add(name)
+        return value
+
+    @property
+    def ignore(self) -> Ignore:
+        return self._lazy('ignore', self._resolve_ignore)
+
+    @property
+    def filesets(self) -> list[Fileset]:
+        return self._lazy('filesets', self._resolve_filesets)
+
+    @property
+    def includes(self) -> list[Include]:
+        return self._lazy('includes', self._resolve_includes)
+
+    @property
+    def block_designs(self) -> BlockDesigns:
+        return self._lazy('block_designs', self._resolve_block_designs)
+
+    @property
+    def remotes(self) -> Remote:
+        return self._lazy('remotes', self._resolve_remotes)
+
+    @property
+    def cache(self) -> Path:
+        """ Folder for files that can be regenerated at any time. """
+
+        cache = self.root / 'vivamir' / 'cache'
+        cache.mkdir(parents=True, exist_ok=True)
+        return cache
 
     def first_fileset(self, kind: FilesetKind) -> Optional[Fileset]:
         return next(f for f in self.filesets if f.kind == kind)
 
     @classmethod
     def load(cls, root: Path) -> 'Vivamir':
+        """
+        Parses the configuration, sections needing files or subprocesses are resolved on first access.
+
+        Use `check` to resolve them all at once.
+        """
+
         def _resolve_relative(path: Path) -> Optional[ProjectPath]:
             return ProjectPath((root / path).resolve().relative_to(root))
 
+        config = tomllib.loads((root / 'vivamir.toml').read_text(), parse_float=Decimal)
         self = dacite.from_dict(
-            cls, tomllib.loads((root / 'vivamir.toml').read_text(), parse_float=Decimal),
+            cls, {f'_{key}' if key in _LAZY else key: value for key, value in config.items()},
             dacite.Config(
                 strict=True, cast=[
                     float, set, Enum, Path,
@@ -182,39 +261,76 @@ class Vivamir:
             raise ValueError('Incompatible configuration.')
 
         self.root = root
+        return self
 
-        if not ((self.ignore.include is None) ^ (self.ignore.list is None)):
-            raise ValueError('Either ignore include or list must be specified.')
-
-        if self.ignore.include is not None:
-            include = (root / self.ignore.include).resolve(strict=True)
-            self.ignore.list = set(_resolve_relative(Path(line)) for line in include.read_text().splitlines()
-                                   if len(line) > 0 and not line.startswith('#'))
-
-        for fileset in self.filesets:
-            fileset.resolve(root)
+    def check(self):
+        """ Resolves every section, raising the first error found. """
 
-        if self.includes is None:
-            self.includes = []
+        for name in _LAZY:
+            getattr(self, name)
 
-        for include in self.includes:
-            include.resolve(root)
+    def _resolve_ignore(self, ignore: Ignore) -> Ignore:
+        if not ((ignore.include is None) ^ (ignore.list is None)):
+            raise ValueError('Either ignore include or list must be specified.')
 
-        for bd in self.block_designs.trusted:
+        if ignore.include is not None:
+            include = (self.root / ignore.include).resolve(strict=True)
+            ignore.list = set(ProjectPath((self.root / line).resolve().relative_to(self.root))
+                              for line in include.read_text().splitlines()
+                              if len(line) > 0 and not line.startswith('#'))
+        return ignore
+
+    def _resolve_filesets(self, filesets: list[Fileset]) -> list[Fileset]:
+        for fileset in filesets:
+            fileset.resolve(self.root)
+        return filesets
+
+    def _resolve_includes(self, includes: Optional[list[Include]]) -> list[Include]:
+        for include in includes or []:
+            include.resolve(self.root)
+        return includes or []
+
+    def _resolve_block_designs(self, block_designs: BlockDesigns) -> BlockDesigns:
+        for bd in block_designs.trusted:
             if bd.suffix != '.tcl':
                 raise ValueError("Block designs must have '.tcl' suffix")
+        return block_designs
 
-        if self.remotes.ssh is None:
-            self.remotes.ssh = []
+    def _resolve_remotes(self, remotes: Remote) -> Remote:
+        if remotes.ssh is None:
+            remotes.ssh = []
+        return remotes
 
-        return self
+    @staticmethod
+    def search_root() -> Optional[Path]:
+        """ Folder of the closest `vivamir.toml`, without reading it. """
 
-    @classmethod
-    def search(cls) -> Optional['Vivamir']:
         root = Path.cwd()
         while not (root / 'vivamir.toml').exists():
             if root.parent == root:
                 return None
             else:
                 root = root.parent
-        return cls.load(root)
+        return root
+
+    @classmethod
+    def search(cls) -> Optional['Vivamir']:
+        root = cls.search_root()
+        return cls.load(root) if root is not None else None
+
+    @classmethod
+    def discover(cls, directory: Path) -> list[Path]:
+        """ Finds the root folder of every project below the given directory. """
+
+        roots = []
+        for current, folders, files in os.walk(directory):
+            if 'vivamir.toml' in files:
+                roots.append(Path(current))
+                # Generated files never contain other projects.
+                if 'vivamir' in folders:
+                    folders.remove('vivamir')
+
+            folders[:] = sorted(folder for folder in folders if not folder.startswith('.'))
+
+        return roots
+
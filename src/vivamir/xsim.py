@@ -0,0 +1,354 @@
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from rich import print
+from rich.markup import escape
+
+from vivamir.files import FileIndex, folders, INCLUDE
+from vivamir.utility import git
+from vivamir.utility.hdl import HEADER_EXTENSIONS, Source, resolve_include
+from vivamir.vivamir import Vivamir, FilesetKind
+
+# Library of the design sources and of every VHDL source, which refer to each other through `work` and must share one.
+LIBRARY = 'xil_defaultlib'
+# Library of the Verilog simulation sources, so that changing a testbench leaves the design compiled.
+LIBRARIES = {FilesetKind.DES: LIBRARY, FilesetKind.SIM: 'xil_simlib'}
+# Libraries of the Xilinx primitives, as Vivado passes them to xelab.
+XILINX_LIBRARIES = ('unisims_ver', 'unimacro_ver', 'secureip')
+
+
+@dataclasses.dataclass(slots=True)
+class Unit:
+    """ A source file to compile, with the files it must be compiled after. """
+
+    relative: str
+    source: Source
+    library: str
+    dependencies: list[str]
+    key: str = ''
+
+
+def _ordered(units: list[Unit]) -> list[Unit]:
+    """ Sorts the units so that each comes after what it depends on, leaving cycles to the compiler. """
+
+    by_relative = {unit.relative: unit for unit in units}
+    result, done = [], set()
+
+    def _visit(unit: Unit, visiting: set[str]):
+        if unit.relative in done or unit.relative in visiting:
+            return
+        for dependency in unit.dependencies:
+            if dependency in by_relative:
+                _visit(by_relative[dependency], visiting | {unit.relative})
+        done.add(unit.relative)
+        result.append(unit)
+
+    for unit in sorted(units, key=lambda unit: unit.relative):
+        _visit(unit, set())
+    return result
+
+
+class XsimFlow:
+    """
+    Simulates without a project, calling xvlog/xvhdl, xelab and xsim directly.
+
+    Design and simulation sources are compiled into separate libraries. Only the sources whose key changed are
+    compiled again into their library, in one call per library, and libraries are compiled in parallel. As in the
+    project, the headers of the include folders are global: they are compiled first in every call. When a source
+    defines macros, later sources may use them, so its whole library is compiled again in one call instead.
+    """
+
+    def __init__(self, vivamir: Vivamir, vivado_executable: list[str], jobs: int):
+        self.vivamir = vivamir
+        self.folder = vivamir.root / 'vivamir' / 'xsim'
+        self.jobs = jobs
+        # The tools live next to the vivado executable, or in the PATH.
+        executable = Path(vivado_executable[0])
+        self.bin = executable.parent if executable.parent != Path('.') else None
+        # Filled by plan, the headers compiled first in every call.
+        self.global_includes: list[str] = []
+
+    def tool(self, name: str) -> str:
+        return str(self.bin / name) if self.bin is not None else name
+
+    def _work(self, library: str) -> Path:
+        return self.folder / 'work' / library
+
+    def _log(self, name: str) -> Path:
+        return self.folder / 'logs' / f'{name}.log'
+
+    def plan(self) -> dict[str, Unit]:
+        """ Scans the sources of the simulation, computing their library, what each depends on and its key. """
+
+        index = FileIndex.load(self.vivamir)
+        libraries: dict[str, str] = {}
+        for kind in LIBRARIES:
+            for _, file, _ in index.select([kind.value]):
+                if not file.endswith(HEADER_EXTENSIONS):
+                    libraries.setdefault(file, LIBRARIES[kind])
+        # Xilinx primitives need the global set/reset module, when Vivado is installed.
+        if (vivado := os.environ.get('XILINX_VIVADO')) and (glbl := Path(vivado) / 'data/verilog/src/glbl.v').exists():
+            libraries[str(glbl)] = LIBRARY
+
+        sources = {relative: Source.scan(self.vivamir.root / relative) for relative in libraries}
+        providers = {}
+        for relative, source in sources.items():
+            for name in (source.packages if source.language == 'verilog' else source.units):
+                providers.setdefault((source.language, name), relative)
+
+        units = {}
+        for relative, source in sources.items():
+            dependencies = sorted(set(
+                provider for name in source.references
+                if (provider := providers.get((source.language, name))) is not None and provider != relative
+            ))
+            library = LIBRARY if source.language == 'vhdl' else libraries[relative]
+            units[relative] = Unit(relative=relative, source=source, library=library, dependencies=dependencies)
+
+        # The project marks the headers of the include folders as global includes.
+        self.global_includes = sorted(file for _, file, _ in index.select([INCLUDE])
+                                      if file.endswith(HEADER_EXTENSIONS))
+        self._keys(units)
+        return units
+
+    def _keys(self, units: dict[str, Unit]):
+        """ Keys change with the content of a source, of what it includes, and of what it depends on. """
+
+        include_dirs = folders(self.vivamir)
+        headers = [self.vivamir.root / file for _, file, _ in
+                   FileIndex.load(self.vivamir).select([kind.value for kind in FilesetKind] + [INCLUDE])
+                   if file.endswith(HEADER_EXTENSIONS)]
+        hashes = git.fingerprints(self.vivamir.root, [*headers, *(self.vivamir.root / unit for unit in units)])
+        scanned = {str(self.vivamir.root / relative): unit.source for relative, unit in units.items()}
+        includes: dict[str, list[str]] = {}
+
+        def _hash(path: Path) -> str:
+            return hashes.get(str(path)) or git.blob_hash(path)
+
+        def _included(path: Path, seen: set[str]) -> list[str]:
+            """ Hashes of every file included, directly or not. """
+
+            if str(path) in includes:
+                return includes[str(path)]
+            result = []
+            for name, _ in (scanned.get(str(path)) or Source.scan(path)).includes:
+                if (found := resolve_include(name, path, include_dirs)) is None:
+                    result.append(f'missing:{name}')
+                elif str(found) not in seen:
+                    result.append(f'{name}:{_hash(found)}')
+                    result.extend(_included(found, seen | {str(found)}))
+            includes[str(path)] = result
+            return result
+
+        # Compiled before every source, so any change to them changes every key.
+        shared = {
+            'globals': [[file, _hash(self.vivamir.root / file), _included(self.vivamir.root / file, set())]
+                        for file in self.global_includes],
+            'include_dirs': [str(folder) for folder in include_dirs],
+        }
+
+        def _key(unit: Unit, visiting: set[str]) -> str:
+            if unit.key:
+                return unit.key
+
+            path = self.vivamir.root / unit.relative
+            inputs = {
+                **shared,
+                'content': _hash(path),
+                'library': unit.library,
+                'includes': _included(path, {str(path)}),
+                # Cycles are left to the compiler to report.
+                'dependencies': [_key(units[dependency], visiting | {unit.relative})
+                                 for dependency in unit.dependencies if dependency not in visiting],
+            }
+            unit.key = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+            return unit.key
+
+        for unit in units.values():
+            _key(unit, {unit.relative})
+
+    def _state(self) -> dict:
+        try:
+            state = json.loads((self.folder / 'state.json').read_text())
+            return state if 'units' in state else {'units': {}, 'snapshot': None}
+        except (OSError, ValueError):
+            return {'units': {}, 'snapshot': None}
+
+    def _save_state(self, state: dict):
+        temporary = self.folder / 'state.tmp'
+        temporary.write_text(json.dumps(state))
+        temporary.replace(self.folder / 'state.json')
+
+    def _initfile(self, libraries: list[str]) -> Path:
+        """ Maps every library to its work folder, so the tools find them from anywhere. """
+
+        initfile = self.folder / 'xsim.ini'
+        initfile.write_text(''.join(f'{name}={self._work(name) / "xsim.dir" / name}\n' for name in sorted(libraries)))
+        return initfile
+
+    def _compile(self, library: str, batch: list[Unit], whole: bool, dependencies: list[str], initfile: Path) -> int:
+        work = self._work(library)
+        if whole:
+            # Compiled from scratch, so units removed from the sources do not linger.
+            shutil.rmtree(work, ignore_errors=True)
+        work.mkdir(parents=True, exist_ok=True)
+        arguments = [
+            '--work', f'{library}={work / "xsim.dir" / library}',
+            '--initfile', str(initfile),
+            *(argument for dependency in dependencies for argument in ('-L', dependency)),
+        ]
+
+        if verilog := [unit.relative for unit in batch if unit.source.language == 'verilog']:
+            # One call, so that macros defined by the global includes and earlier sources are seen by later ones.
+            project = self.folder / 'logs' / f'{library}.prj'
+            project.write_text(''.join(
+                f'{"sv" if file.endswith((".sv", ".svh")) else "verilog"} {library} "{self.vivamir.root / file}"\n'
+                for file in [*self.global_includes, *verilog]
+            ))
+            includes = [argument for folder in folders(self.vivamir) for argument in ('-i', str(folder))]
+            code = subprocess.run([self.tool('xvlog'), *arguments, *includes, '--log', str(self._log(library)),
+                                   '--prj', str(project)], cwd=work,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+            if code != 0:
+                return code
+
+        if vhdl := [unit.relative for unit in batch if unit.source.language == 'vhdl']:
+            return subprocess.run([self.tool('xvhdl'), *arguments, '--log', str(self._log(f'{library}_vhdl')),
+                                   *(str(self.vivamir.root / file) for file in vhdl)], cwd=work,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+        return 0
+
+    def compile(self, units: dict[str, Unit], state: dict) -> list[str]:
+        """ Compiles the sources whose key changed, libraries they depend on first, returning the failed libraries. """
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+        (self.folder / 'logs').mkdir(exist_ok=True)
+        compiled: dict[str, list] = state['units']
+
+        members: dict[str, list[Unit]] = {}
+        for unit in units.values():
+            members.setdefault(unit.library, []).append(unit)
+        for library in set(library for _, library in compiled.values()) - set(members):
+            shutil.rmtree(self._work(library), ignore_errors=True)
+        compiled = {relative: value for relative, value in compiled.items() if value[1] in members}
+
+        # Library to the units to compile, and whether the library is compiled from scratch.
+        pending: dict[str, tuple[list[Unit], bool]] = {}
+        for library, library_units in members.items():
+            changed = [unit for unit in library_units if compiled.get(unit.relative, [None])[0] != unit.key]
+            recorded = set(relative for relative, (_, owner) in compiled.items() if owner == library)
+            # Units of removed sources would linger in the library.
+            removed = bool(recorded - set(unit.relative for unit in library_units))
+            if not changed and not removed and self._work(library).exists():
+                continue
+            whole = (removed or not recorded or not self._work(library).exists()
+                     # Later sources may use the macros of any other.
+                     or any(unit.source.macros for unit in library_units))
+            if whole:
+                compiled = {relative: value for relative, value in compiled.items() if value[1] != library}
+            pending[library] = (_ordered(library_units if whole else changed), whole)
+        state['units'] = compiled
+
+        count = sum(len(batch) for batch, _ in pending.values())
+        print(f'INFO: [Vivamir] Compiling {count} sources, {len(units) - count} unchanged.')
+        if not pending:
+            return []
+
+        dependencies = {library: sorted(set(units[dependency].library for unit in library_units
+                                            for dependency in unit.dependencies) - {library})
+                        for library, library_units in members.items()}
+        initfile = self._initfile(list(members))
+        failed = []
+        running: dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                busy = set(pending) | set(running.values())
+                ready = [library for library in pending
+                         if not any(dependency in busy for dependency in dependencies[library])]
+                if not ready and not running:
+                    # Only cycles are left, let the compiler complain about them.
+                    ready = list(pending)
+
+                for library in ready:
+                    batch, whole = pending.pop(library)
+                    if any(dependency in failed for dependency in dependencies[library]):
+                        failed.append(library)
+                        continue
+                    running[pool.submit(self._compile, library, batch, whole, dependencies[library], initfile)] = \
+                        library
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    library = running.pop(future)
+                    if future.result() == 0:
+                        compiled.update((unit.relative, [unit.key, library]) for unit in members[library]
+                                        if compiled.get(unit.relative, [None])[0] != unit.key)
+                    else:
+                        failed.append(library)
+                        for unit in members[library]:
+                            if compiled.get(unit.relative, [None])[0] != unit.key:
+                                compiled.pop(unit.relative, None)
+                        print(f'[bold red]ERROR: [Vivamir] Failed to compile library {escape(library)}, '
+                              f'see {self._log(library)!s}')
+
+        return failed
+
+    def _run(self, arguments: list[str]) -> tuple[int, bytes]:
+        """ Runs a tool in the xsim folder, echoing and returning its output. """
+
+        output = []
+        process = subprocess.Popen(arguments, cwd=self.folder, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        for line in process.stdout:
+            sys.stdout.write(line.decode(errors='replace'))
+            output.append(line)
+        sys.stdout.flush()
+        return process.wait(), b''.join(output)
+
+    def run(self) -> tuple[int, bytes]:
+        """ Compiles, elaborates and simulates the simulation top, returning the exit code and log. """
+
+        top = self.vivamir.simulation_top
+        units = self.plan()
+        state = self._state()
+        failed = self.compile(units, state)
+        self._save_state(state)
+        if failed:
+            return 1, ''.join(f'ERROR: [Vivamir] Failed to compile library {name}\n' for name in failed).encode()
+
+        owner = next((unit for unit in units.values() if top in unit.source.units
+                      or top.lower() in unit.source.units and unit.source.language == 'vhdl'), None)
+        if owner is None:
+            return 1, f'ERROR: [Vivamir] Simulation top {top} is not declared by any source.\n'.encode()
+
+        snapshot = hashlib.sha256(json.dumps([top, sorted(unit.key for unit in units.values())]).encode()).hexdigest()
+        if state['snapshot'] != snapshot or not (self.folder / 'xsim.dir' / top).exists():
+            print(f'INFO: [Vivamir] Elaborating {top}...')
+            libraries = sorted(set(unit.library for unit in units.values()))
+            glbl = [f'{unit.library}.glbl' for unit in units.values() if 'glbl' in unit.source.units]
+            code, log = self._run([
+                self.tool('xelab'), '--initfile', str(self._initfile(libraries)), '--debug', 'typical', '--relax',
+                *(argument for library in [*libraries, *XILINX_LIBRARIES] for argument in ('-L', library)),
+                '--snapshot', top, f'{owner.library}.{top}', *glbl, '--log', str(self._log('elaborate')),
+            ])
+            if code != 0:
+                return code, log
+
+            state['snapshot'] = snapshot
+            self._save_state(state)
+        else:
+            print(f'INFO: [Vivamir] Elaborated {top} is up to date.')
+
+        return self._run([
+            self.tool('xsim'), top, '--runall', '--wdb', f'{top}.wdb', '--log', str(self._log('simulate')),
+        ])
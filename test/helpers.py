@@ -0,0 +1,27 @@
+from pathlib import Path
+from typing import Optional
+
+from vivamir.utility.paths import DEFAULT
+from vivamir.utility.version import SemanticVersion
+
+
+class AnyKey:
+    """ Fills the default configuration template, every key with its own name. """
+
+    def __getitem__(self, item):
+        if item in ['major', 'minor', 'patch']:
+            return SemanticVersion.project().__getattribute__(item)
+        return item
+
+
+def default_config() -> str:
+    return (DEFAULT / 'vivamir.pyl').read_text().format_map(AnyKey())
+
+
+def make_project(tmp: Path, ignore: Optional[str] = None, simulation_top: str = '') -> Path:
+    """ Writes the default configuration in the folder, with the default ignore list unless given one. """
+
+    (tmp / 'vivamir.toml').write_text(
+        default_config().replace("simulation_top = ''", f"simulation_top = '{simulation_top}'"))
+    (tmp / 'vivamir.ignore').write_text((DEFAULT / 'vivamir.ignore').read_text() if ignore is None else ignore)
+    return tmp
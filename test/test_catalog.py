@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+
+from vivamir.catalog import Catalog
+
+# Stands in for a patched Vivado running the dump script, writing to the files after `-tclargs`.
+FAKE_VIVADO = f"""#!{sys.executable}
+import sys
+version, parts, boards = sys.argv[sys.argv.index('-tclargs') + 1:]
+open(version, 'w').write('2022.2.2\\n')
+open(parts, 'w').write('xc7z020clg400-1\\nxc7z020clg484-1\\nxc7z010clg400-1\\nxczu7ev-ffvc1156-2-e\\nXC7A35TICSG324-1L\\n')
+open(boards, 'w').write('xilinx.com:zcu104:part0:1.1\\txczu7ev-ffvc1156-2-e\\n'
+                        'digilentinc.com:arty-z7-20:part0:1.1\\txc7z020clg400-1\\n')
+"""
+
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        previous = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = mkdtemp()
+        self.addCleanup(lambda: os.environ.pop('XDG_CACHE_HOME') if previous is None
+                        else os.environ.update(XDG_CACHE_HOME=previous))
+        self.vivado = Path(mkdtemp()) / 'vivado'
+        self.vivado.write_text(FAKE_VIVADO)
+        self.vivado.chmod(0o755)
+
+    def test_dump(self):
+        self.assertIsNone(Catalog.load('2022.2'))
+        self.assertEqual(Catalog.dump([str(self.vivado)]).version, '2022.2')
+        catalog = Catalog.load('2022.2')
+
+        self.assertTrue(catalog.has_part('xc7z020clg400-1'))
+        self.assertTrue(catalog.has_part('xc7a35ticsg324-1L'))
+        self.assertFalse(catalog.has_part('xc7z020clg401-1'))
+        self.assertEqual(catalog.suggest_parts('xc7z020clg401-1', count=2), ['xc7z020clg400-1', 'xc7z020clg484-1'])
+
+        self.assertEqual(catalog.board_ids(), ['arty-z7-20', 'zcu104'])
+        self.assertEqual(catalog.suggest_boards('zcu014'), ['zcu104'])
+        self.assertEqual(catalog.board_parts('arty-z7-20', 'xc7z020clg400-1'), ['digilentinc.com:arty-z7-20:part0:1.1'])
+        self.assertEqual(catalog.board_parts('arty-z7-20', 'xc7z010clg400-1'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+
+from vivamir.files import FileIndex
+from vivamir.vivamir import Vivamir
+from test.helpers import make_project
+
+
+class TestFileIndex(unittest.TestCase):
+    def setUp(self):
+        self.root = make_project(Path(mkdtemp()).resolve(), ignore='src/ignored.sv\n')
+        (self.root / 'src' / 'module').mkdir(parents=True)
+        (self.root / 'src' / 'module' / 'a.sv').touch()
+        (self.root / 'src' / 'ignored.sv').touch()
+        (self.root / 'src' / 'notes.txt').touch()
+
+    def test_select(self):
+        index = FileIndex.load(Vivamir.load(self.root))
+
+        self.assertEqual(list(index.select(['design'])), [('design', 'src/module/a.sv', False)])
+        self.assertEqual(list(index.select(['design'], ['.txt'])), [('design', 'src/notes.txt', False)])
+        self.assertEqual(list(index.select(['simulation'])), [])
+
+    def test_stale(self):
+        vivamir = Vivamir.load(self.root)
+        FileIndex.load(vivamir)
+        (self.root / 'src' / 'module' / 'b.sv').touch()
+        (self.root / 'test').mkdir()
+        (self.root / 'test' / 'tb.sv').touch()
+
+        index = FileIndex.load(vivamir)
+        self.assertEqual([file for _, file, _ in index.select(['design', 'simulation'])],
+                         ['src/module/a.sv', 'src/module/b.sv', 'test/tb.sv'])
+
+    def test_exec(self):
+        (self.root / 'vivamir.toml').write_text((self.root / 'vivamir.toml').read_text().replace(
+            "{ kind = 'design', path = 'src' }", "{ kind = 'design', exec = 'cat folder' }"))
+        (self.root / 'other').mkdir()
+        (self.root / 'other' / 'c.sv').touch()
+        (self.root / 'folder').write_text(str(self.root / 'src'))
+        FileIndex.load(Vivamir.load(self.root))
+
+        # Only the output of the command changed.
+        (self.root / 'folder').write_text(str(self.root / 'other'))
+        index = FileIndex.load(Vivamir.load(self.root))
+        self.assertEqual([file for _, file, _ in index.select(['design'])], ['other/c.sv'])
+
+
+if __name__ == '__main__':
+    unittest.main()
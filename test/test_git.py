@@ -0,0 +1,57 @@
+import shutil
+import subprocess
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+
+from vivamir.utility import git
+
+
+@unittest.skipUnless(shutil.which('git'), 'Requires git.')
+class TestGit(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(mkdtemp())
+        for args in (['init', '-q'], ['config', 'user.email', 'test@example.com'], ['config', 'user.name', 'test']):
+            subprocess.run(['git', *args], cwd=self.root, check=True)
+        (self.root / 'tracked.v').write_text('module tracked; endmodule\n')
+        (self.root / 'modified.v').write_text('module modified; endmodule\n')
+        subprocess.run(['git', 'add', '.'], cwd=self.root, check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', 'initial'], cwd=self.root, check=True)
+
+    def hash_object(self, name: str) -> str:
+        return subprocess.run(['git', 'hash-object', name], cwd=self.root, check=True,
+                              capture_output=True, text=True).stdout.strip()
+
+    def test_fingerprints(self):
+        (self.root / 'modified.v').write_text('module modified(); endmodule\n')
+        (self.root / 'untracked.v').write_text('module untracked; endmodule\n')
+
+        names = ['tracked.v', 'modified.v', 'untracked.v']
+        fingerprints = git.fingerprints(self.root, [self.root / name for name in names + ['missing.v']])
+        self.assertEqual(fingerprints, {str(self.root / name): self.hash_object(name) for name in names})
+
+    def test_changes(self):
+        files = [self.root / 'tracked.v', self.root / 'modified.v', self.root / 'untracked.v']
+        baseline = git.Baseline(self.root / 'cache' / 'baseline.json')
+        baseline.save(git.fingerprints(self.root, files))
+        self.assertFalse(baseline.changes(git.fingerprints(self.root, files)))
+
+        (self.root / 'modified.v').write_text('module modified(); endmodule\n')
+        (self.root / 'tracked.v').unlink()
+        (self.root / 'untracked.v').write_text('module untracked; endmodule\n')
+
+        changes = baseline.changes(git.fingerprints(self.root, files))
+        self.assertEqual(changes.added, {str(self.root / 'untracked.v')})
+        self.assertEqual(changes.removed, {str(self.root / 'tracked.v')})
+        self.assertEqual(changes.modified, {str(self.root / 'modified.v')})
+
+    def test_dirty(self):
+        self.assertEqual(git.dirty(self.root), [])
+        subprocess.run(['git', 'mv', 'tracked.v', 'renamed.v'], cwd=self.root, check=True)
+        (self.root / 'untracked.v').write_text('')
+        self.assertEqual(git.dirty(self.root), ['R  renamed.v', '?? untracked.v'])
+        self.assertIsNone(git.dirty(Path(mkdtemp())))
+
+
+if __name__ == '__main__':
+    unittest.main()
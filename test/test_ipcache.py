@@ -0,0 +1,46 @@
+import os
+import time
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+from unittest import mock
+
+from vivamir.ipcache import IpCache
+
+
+class TestIpCache(unittest.TestCase):
+    def test_evict(self):
+        folder = Path(mkdtemp())
+        for name, last_use in [('0123456789abcdef', 100), ('fedcba9876543210', 200),
+                               ('00112233445566ff', time.time() - 60)]:
+            entry = folder / '2022.2' / name[0] / name[1] / name
+            (entry / 'sim').mkdir(parents=True)
+            (entry / 'sim' / 'ip.v').write_bytes(b'0' * 100)
+            (entry / 'ip.dcp').write_bytes(b'0' * 100)
+            for file in [entry / 'ip.dcp', entry / 'sim' / 'ip.v', entry / 'sim', entry]:
+                os.utime(file, (last_use, last_use))
+        (folder / '2022.2' / 'stats.json').write_text('{}')
+
+        cache = IpCache(folder, max_size=500, grace=3600)
+        self.assertEqual([(entry.name, size) for entry, size, _ in cache.entries()],
+                         [('0123456789abcdef', 200), ('fedcba9876543210', 200), ('00112233445566ff', 200)])
+        self.assertEqual(cache.evict(), 1)
+        self.assertEqual([entry.name for entry, _, _ in cache.entries()], ['fedcba9876543210', '00112233445566ff'])
+        self.assertTrue((folder / '2022.2' / 'stats.json').exists())
+
+        # Recently used IPs stay, whatever the size.
+        cache.max_size = 0
+        self.assertEqual(cache.evict(), 1)
+        self.assertEqual([entry.name for entry, _, _ in cache.entries()], ['00112233445566ff'])
+
+    def test_settings(self):
+        config = Path(mkdtemp())
+        with mock.patch.dict(os.environ, {'XDG_CONFIG_HOME': str(config)}):
+            self.assertEqual((IpCache.of().max_size, IpCache.of().grace), (8192 * 2 ** 20, 168 * 3600))
+            (config / 'vivamir').mkdir()
+            (config / 'vivamir' / 'settings.toml').write_text('ip_cache_size = 1\nip_cache_grace = 0\n')
+            self.assertEqual((IpCache.of().max_size, IpCache.of().grace), (2 ** 20, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+
+from vivamir.utility.flood import FloodControl
+from vivamir.utility.logs import LogFollower, LogIndex
+
+
+class TestLogFollower(unittest.TestCase):
+    def test_rotation(self):
+        tmp = Path(mkdtemp())
+        log = tmp / 'vivado.log'
+        log.write_text('before\n')
+
+        follower = LogFollower(log)
+        self.assertEqual(follower.poll(), [])
+
+        with open(log, 'a') as file:
+            file.write('first\nsec')
+        self.assertEqual(follower.poll(), ['first'])
+
+        with open(log, 'a') as file:
+            file.write('ond\n')
+        os.rename(log, tmp / 'vivado_1.backup.log')
+        log.write_text('third\n')
+        self.assertEqual(follower.poll(), ['second', 'third'])
+        follower.close()
+
+    def test_following(self):
+        log = Path(mkdtemp()) / 'vivado.log'
+        log.write_text('before\n')
+
+        # Lines written right after following starts are not skipped.
+        lines = []
+        with LogFollower(log, interval=60).following(lines.append):
+            with open(log, 'a') as file:
+                file.write('first\n')
+        self.assertEqual(lines, ['first'])
+
+
+class TestLogIndex(unittest.TestCase):
+    def test_incremental(self):
+        tmp = Path(mkdtemp())
+        log = tmp / 'vivado.log'
+        log.write_text(
+            'INFO: [Synth 8-1] a\n'
+            'WARNING: [Synth 8-3331] b\n'
+            'CRITICAL WARNING: [Place 30-1] c\n'
+            'WARNING: [Synth 8-3331] partial'
+        )
+
+        index = LogIndex.load(log, tmp / 'cache')
+        self.assertEqual(list(index.query(log, 'Synth 8-*', 'warning')), ['WARNING: [Synth 8-3331] b'])
+        self.assertEqual(list(index.query(log, severity='critical warning')), ['CRITICAL WARNING: [Place 30-1] c'])
+
+        with open(log, 'a') as file:
+            file.write(' d\nERROR: [Synth 8-2] e\n')
+
+        index = LogIndex.load(log, tmp / 'cache')
+        self.assertEqual(list(index.query(log, 'Synth 8-*')), [
+            'INFO: [Synth 8-1] a',
+            'WARNING: [Synth 8-3331] b',
+            'WARNING: [Synth 8-3331] partial d',
+            'ERROR: [Synth 8-2] e',
+        ])
+        self.assertEqual(index.counts['WARNING\tSynth 8-3331'], 2)
+
+
+class TestFloodControl(unittest.TestCase):
+    def test_limits(self):
+        flood = FloodControl(limit=2, summary_every=3, limits={'Synth 8-1': 0})
+        lines = [
+            *(f'WARNING: [Synth 8-3331] port {i}' for i in range(8)),
+            'INFO: [Synth 8-1] hidden',
+            'ERROR: [Synth 8-1] shown',
+            'not a message',
+        ]
+
+        self.assertEqual([flood.feed(line) for line in lines], [
+            'WARNING: [Synth 8-3331] port 0',
+            'WARNING: [Synth 8-3331] port 1',
+            None, None,
+            'WARNING: (×3 more [Synth 8-3331])',
+            None, None,
+            'WARNING: (×6 more [Synth 8-3331])',
+            None,
+            'ERROR: [Synth 8-1] shown',
+            'not a message',
+        ])
+        self.assertEqual([(message_id, count.total, count.hidden) for message_id, count in flood.histogram()],
+                         [('Synth 8-3331', 8, 6), ('Synth 8-1', 1, 1), ('Synth 8-1', 1, 0)])
+
+    def test_severities(self):
+        flood = FloodControl(limit=1, summary_every=100)
+        lines = ['INFO: [Common 17-1] a', 'INFO: [Common 17-1] b', 'CRITICAL WARNING: [Common 17-1] c']
+        self.assertEqual([flood.feed(line) for line in lines], [lines[0], None, lines[2]])
+        self.assertEqual([(count.severity, count.total) for _, count in flood.histogram()],
+                         [('INFO', 2), ('CRITICAL WARNING', 1)])
+
+    def test_continuation(self):
+        flood = FloodControl(limit=1, summary_every=100)
+        lines = [
+            'WARNING: [Synth 8-7129] first',
+            '    detail',
+            'WARNING: [Synth 8-7129] second',
+            '    detail',
+            'WARNING: [Synth 8-7023] listing:',
+            'line one',
+            'WARNING: [Synth 8-7023] listing again:',
+            'line two',
+            '',
+            'Starting synthesis',
+        ]
+        self.assertEqual([flood.feed(line) for line in lines], [
+            lines[0], lines[1], None, None, lines[4], lines[5], None, None, '', 'Starting synthesis',
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+
+from vivamir.commands.generate import _generate_commons, _generate_update
+from vivamir.manifest import Manifest
+from vivamir.vivamir import Vivamir
+from test.helpers import make_project
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.root = make_project(Path(mkdtemp()).resolve())
+        (self.root / 'src').mkdir()
+        (self.root / 'src' / 'a.sv').write_text('module a; endmodule')
+        (self.root / 'src' / 'b.sv').write_text('module b; endmodule')
+
+    def test_unchanged(self):
+        vivamir = Vivamir.load(self.root)
+        previous = Manifest.build(vivamir)
+        current = Manifest.build(vivamir)
+
+        self.assertFalse(current.requires_rebuild(previous))
+        self.assertEqual(current.delta(previous).kinds(), [])
+
+    def test_delta(self):
+        vivamir = Vivamir.load(self.root)
+        previous = Manifest.build(vivamir)
+        (self.root / 'src' / 'a.sv').write_text('module a(); endmodule')
+        (self.root / 'src' / 'b.sv').unlink()
+        (self.root / 'src' / 'c.sv').touch()
+        delta = Manifest.build(vivamir).delta(previous)
+
+        a, b, c = (str(self.root / 'src' / name) for name in ['a.sv', 'b.sv', 'c.sv'])
+        self.assertEqual(sorted(delta.removed['sources_1']), [a, b])
+        self.assertEqual(sorted(delta.added['sources_1']), [a, c])
+        self.assertEqual(sorted(delta.imported['sources_1']), [a, c])
+
+        # Linked files are edited in place.
+        vivamir.project.link = True
+        previous = Manifest.build(vivamir)
+        (self.root / 'src' / 'a.sv').write_text('module a(input x); endmodule')
+        delta = Manifest.build(vivamir).delta(previous)
+        self.assertEqual(delta.kinds(), [])
+
+    def test_rebuild(self):
+        vivamir = Vivamir.load(self.root)
+        previous = Manifest.build(vivamir)
+        vivamir.vivado.part = 'another'
+
+        self.assertTrue(Manifest.build(vivamir).requires_rebuild(previous))
+        self.assertTrue(Manifest.build(vivamir).requires_rebuild(None))
+
+    def test_update_script(self):
+        vivamir = Vivamir.load(self.root)
+        previous = Manifest.build(vivamir)
+        (self.root / 'src' / '$a[b].sv').touch()
+        script = _generate_update(vivamir, Manifest.build(vivamir).delta(previous))
+
+        # Paths are never substituted by Tcl.
+        self.assertIn(f'[list {{{self.root}/src/$a[b].sv}}]', script)
+
+    def test_jobs(self):
+        vivamir = Vivamir.load(self.root)
+        # Counted by the machine running Vivado, unless configured.
+        self.assertIn('if { [catch {exec nproc} jobs] } {', _generate_commons(vivamir))
+        vivamir.project.jobs = 3
+        self.assertIn('\n        set jobs 3\n', _generate_commons(vivamir))
+
+
+if __name__ == '__main__':
+    unittest.main()
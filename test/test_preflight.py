@@ -0,0 +1,113 @@
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+
+from vivamir.preflight import preflight, run_preflight
+from vivamir.utility import hdl
+from vivamir.vivamir import Vivamir
+from test.helpers import make_project
+
+
+def _errors(text: str, system_verilog: bool = True) -> list[tuple[int, str]]:
+    tokens, errors = hdl.tokenize(text)
+    return errors + hdl.check_structure(tokens, system_verilog)
+
+
+class TestStructure(unittest.TestCase):
+    def test_valid(self):
+        self.assertEqual(_errors(
+            'module a;\n'
+            '  always begin : named\n    wait fork;\n  end\n'
+            '  assert property (@(posedge clk) x |-> y);\n'
+            '  function automatic int f(); return 0; endfunction\n'
+            'endmodule\n'
+            'typedef class c;\n'
+            'virtual class c;\n'
+            '  pure virtual function void g();\n'
+            '  extern function void h();\n'
+            'endclass\n'
+            '`ifdef WIDE\nmodule b(input [15:0] x);\n`else\nmodule b(input [7:0] x);\n`endif\nendmodule\n'
+            '`define BLOCK begin \\\n  end\n'
+        ), [])
+
+    def test_qualifiers(self):
+        # Qualifiers far from the keyword, and blocks Verilog does not have.
+        self.assertEqual(_errors(
+            'import "DPI-C" context c_f = function void f(int x);\n'
+            'class c;\n'
+            '  extern static protected virtual function void f();\n'
+            '  task t();\n'
+            '    randsequence(main)\n      main : first second;\n      first : { x = 1; };\n    endsequence\n'
+            '  endtask\n'
+            'endclass\n'
+        ), [])
+
+    def test_mismatch(self):
+        self.assertEqual(_errors('module a;\n  begin\nendmodule\n'), [(3, 'Unexpected `endmodule`, `begin` opened at line 2 is still open.')])
+        self.assertEqual(_errors('module a;\n'), [(1, '`module` is never closed.')])
+        self.assertEqual(_errors('module a;\n  x = (1 + 2;\nendmodule\n'), [(3, 'Unexpected `endmodule`, `(` opened at line 2 is still open.')])
+
+    def test_lexical(self):
+        self.assertEqual(_errors('module a; /* never closed\nendmodule\n')[0], (1, 'Block comment is never closed.'))
+        self.assertEqual(_errors('module a;\n  string s = "never closed\nendmodule\n')[0], (2, 'String is not closed on the same line.'))
+
+    def test_vhdl(self):
+        tokens, errors = hdl.tokenize("entity a is\nend;\narchitecture r of a is\nbegin\n  x <= y'length;\nend;\n", vhdl=True)
+        self.assertEqual(errors + hdl.check_brackets(tokens), [])
+        tokens, errors = hdl.tokenize('x <= (a and b;\n', vhdl=True)
+        self.assertEqual(errors + hdl.check_brackets(tokens), [(1, '`(` is never closed.')])
+
+        # Character literals after reserved words, attributes and qualified expressions after names.
+        tokens, errors = hdl.tokenize("case c is\n  when '(' => x <= t'(')');\n  when others => null;\nend case;\n",
+                                      vhdl=True)
+        self.assertEqual(errors + hdl.check_brackets(tokens), [])
+
+
+class TestPreflight(unittest.TestCase):
+    def setUp(self):
+        self.root = make_project(Path(mkdtemp()).resolve(), ignore='', simulation_top='tb')
+        for folder in ['src', 'test', 'include']:
+            (self.root / folder).mkdir()
+        (self.root / 'include' / 'defs.svh').write_text('`define WIDTH 8\n')
+        (self.root / 'src' / 'a.sv').write_text('`include "defs.svh"\nmodule a;\nendmodule\n')
+        (self.root / 'test' / 'tb.sv').write_text('module tb;\n  a a();\nendmodule\n')
+
+    def diagnostics(self) -> list[str]:
+        return [str(diagnostic) for diagnostic in preflight(Vivamir.load(self.root))]
+
+    def test_clean(self):
+        self.assertEqual(self.diagnostics(), [])
+        self.assertTrue((Vivamir.load(self.root).cache / 'check.json').exists())
+        # Served from the cache.
+        self.assertEqual(self.diagnostics(), [])
+
+    def test_problems(self):
+        self.diagnostics()
+        (self.root / 'src' / 'a.sv').write_text('`include "missing.svh"\nmodule a;\n  begin\nendmodule\n')
+        (self.root / 'test' / 'tb.sv').write_text('module bench;\nendmodule\n')
+        diagnostics = self.diagnostics()
+        self.assertIn('src/a.sv:1: Included file "missing.svh" not found.', diagnostics)
+        self.assertIn('src/a.sv:4: Unexpected `endmodule`, `begin` opened at line 3 is still open.', diagnostics)
+        self.assertTrue(any(diagnostic.startswith('vivamir.toml:') and 'simulation_top tb' in diagnostic
+                            for diagnostic in diagnostics))
+
+    def test_project_mode(self):
+        # Accepted by Vivado as in a project: headers by name, block design wrappers as tops, byte order marks.
+        config = self.root / 'vivamir.toml'
+        config.write_text(config.read_text().replace("design_top     = ''", "design_top     = 'design_1_wrapper'")
+                          .replace('trusted = []', "trusted = ['src/bds/design_1.tcl']"))
+        (self.root / 'src' / 'common').mkdir()
+        (self.root / 'src' / 'common' / 'regs.vh').write_text('`define REGS 4\n')
+        (self.root / 'src' / 'a.sv').write_text('\ufeff`include "regs.vh"\nmodule a;\nendmodule\n', encoding='utf-8')
+        self.assertEqual(self.diagnostics(), [])
+
+    def test_warnings(self):
+        # Structure is only checked to warn, the compiler may know better.
+        (self.root / 'src' / 'a.sv').write_text('module a;\n  begin\nendmodule\n')
+        diagnostics = preflight(Vivamir.load(self.root))
+        self.assertEqual([(str(diagnostic), diagnostic.warning) for diagnostic in diagnostics],
+                         [('src/a.sv:3: Unexpected `endmodule`, `begin` opened at line 2 is still open.', True)])
+        self.assertTrue(run_preflight(Vivamir.load(self.root)))
+
+        (self.root / 'src' / 'a.sv').write_text('module a;\n  string s = "never closed\nendmodule\n')
+        self.assertFalse(run_preflight(Vivamir.load(self.root)))
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import time
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+
+from vivamir.utility.sampler import ResourceSampler, prune_runs
+
+
+@unittest.skipUnless(ResourceSampler.available(), 'Requires /proc.')
+class TestResourceSampler(unittest.TestCase):
+    def test_tree(self):
+        child = subprocess.Popen(['sleep', '5'])
+        try:
+            record = Path(mkdtemp()) / 'runs' / 'test.csv'
+            sampler = ResourceSampler(os.getpid(), interval=0.01, record=record)
+            sampler.phase = 'Phase 1'
+            sample = sampler.sample()
+
+            self.assertGreaterEqual(sample.processes, 2)
+            self.assertGreater(sample.rss, 0)
+            sampler.save()
+            self.assertEqual(record.read_text().splitlines()[0], 'time,cpu,rss,read,write,processes,phase')
+            self.assertTrue(record.read_text().splitlines()[1].endswith(',Phase 1'))
+        finally:
+            child.kill()
+            child.wait()
+
+    def test_baseline(self):
+        sampler = ResourceSampler(os.getpid(), interval=0.01)
+        sampler.baseline()
+        time.sleep(0.1)
+        # This process ran the tests before, none of that is counted.
+        self.assertLess(sampler.sample().cpu, 200)
+
+    def test_prune(self):
+        folder = Path(mkdtemp())
+        for name in ['20240101-000000-open', '20240102-000000-build', '20240103-000000-open']:
+            (folder / f'{name}.csv').touch()
+        prune_runs(folder, keep=2)
+        self.assertEqual(sorted(file.name for file in folder.iterdir()),
+                         ['20240102-000000-build.csv', '20240103-000000-open.csv'])
+
+
+if __name__ == '__main__':
+    unittest.main()
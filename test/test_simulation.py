@@ -0,0 +1,92 @@
+import contextlib
+import os
+import sys
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+from unittest import mock
+
+from typer.testing import CliRunner
+
+from vivamir.files import FileIndex
+from vivamir.main import main
+from vivamir.simulation import SimulationCache, SimulationResult, fingerprint
+from vivamir.utility.cache import LruCache
+from vivamir.vivamir import Vivamir, VivadoProperty
+from test.helpers import make_project
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.root = make_project(Path(mkdtemp()).resolve(), ignore='')
+        (self.root / 'src').mkdir()
+        (self.root / 'src' / 'a.sv').write_text('module a; endmodule\n')
+        (self.root / 'test').mkdir()
+        (self.root / 'test' / 'tb.wcfg').write_text('<wave_config/>\n')
+
+    def fingerprint(self, vivamir: Vivamir) -> str:
+        return fingerprint(vivamir, FileIndex.load(vivamir))
+
+    def test_inputs(self):
+        vivamir = Vivamir.load(self.root)
+        key = self.fingerprint(vivamir)
+        self.assertEqual(self.fingerprint(vivamir), key)
+
+        (self.root / 'test' / 'tb.wcfg').write_text('<wave_config></wave_config>\n')
+        self.assertNotEqual(self.fingerprint(vivamir), key)
+        key = self.fingerprint(vivamir)
+
+        vivamir.vivado.properties.append(VivadoProperty('xsim.simulate.runtime', '1us', '[get_filesets sim_1]'))
+        self.assertNotEqual(self.fingerprint(vivamir), key)
+        key = self.fingerprint(vivamir)
+        vivamir.vivado.properties.append(VivadoProperty('generic', 'WIDTH=16', '[get_filesets sim_1]'))
+        self.assertNotEqual(self.fingerprint(vivamir), key)
+        key = self.fingerprint(vivamir)
+
+        vivamir.block_designs.trusted.append(Path('src/bds/design_1.tcl'))
+        self.assertNotEqual(self.fingerprint(vivamir), key)
+        key = self.fingerprint(vivamir)
+
+        (self.root / 'ips' / 'ip').mkdir(parents=True)
+        (self.root / 'ips' / 'ip' / 'component.xml').write_text('<component/>\n')
+        self.assertNotEqual(self.fingerprint(vivamir), key)
+
+    def test_cache(self):
+        vivamir = Vivamir.load(self.root)
+        cache = SimulationCache(vivamir)
+        self.assertIsNone(cache.get('key'))
+
+        result = SimulationResult.of(0, b'Fatal: assertion failed\n', 1.5)
+        self.assertFalse(result.passed)
+        cache.put('key', result, b'Fatal: assertion failed\n')
+        self.assertEqual(cache.get('key'), (result, b'Fatal: assertion failed\n'))
+
+    def test_failure(self):
+        vivado = Path(mkdtemp()) / 'vivado'
+        vivado.write_text(f'#!{sys.executable}\nimport sys\nsys.exit(1)\n')
+        vivado.chmod(0o755)
+        (self.root / 'vivamir').mkdir()
+
+        with contextlib.chdir(self.root), mock.patch.dict(os.environ, {'XDG_CACHE_HOME': mkdtemp()}):
+            result = CliRunner().invoke(main, ['simulate', '--no-check', '--sample-interval', '0', str(vivado)])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn('Simulation failed', result.output)
+
+
+class TestLruCache(unittest.TestCase):
+    def test_evict(self):
+        cache = LruCache(Path(mkdtemp()), max_size=250)
+        cache.put('a', {'data': b'a' * 100})
+        cache.put('b', {'data': b'b' * 100})
+        os.utime(cache.folder / 'a', (0, 0))
+        os.utime(cache.folder / 'b', (1, 1))
+        self.assertIsNotNone(cache.get('a'))
+
+        cache.put('c', {'data': b'c' * 100})
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
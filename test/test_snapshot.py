@@ -0,0 +1,67 @@
+import os
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+
+from vivamir.snapshot import Snapshots
+
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        root = Path(mkdtemp())
+        self.project = root / 'project'
+        (self.project / 'name.srcs' / 'sources_1').mkdir(parents=True)
+        (self.project / 'name.gen').mkdir()
+        (self.project / 'name.xpr').write_text('<Project/>')
+        (self.project / 'name.srcs' / 'sources_1' / 'a.v').write_text('module a; endmodule')
+        (self.project / 'name.srcs' / 'sources_1' / 'b.v').write_text('module a; endmodule')
+        (self.project / 'link').symlink_to('name.xpr')
+        self.snapshots = Snapshots(root / 'snapshots', max_size=2 ** 20)
+
+    def files(self) -> dict[str, bytes]:
+        return {str(path.relative_to(self.project)): path.read_bytes() if path.is_file() else b''
+                for path in self.project.rglob('*')}
+
+    def test_restore(self):
+        before = self.files()
+        report = self.snapshots.save('main', self.project, 'key')
+        self.assertEqual(report.files, 3)
+        # Equal files are stored once.
+        self.assertEqual(self.snapshots.size(), len('<Project/>') + len('module a; endmodule'))
+
+        (self.project / 'name.xpr').write_text('<Project changed/>')
+        (self.project / 'name.srcs' / 'sources_1' / 'b.v').unlink()
+        (self.project / 'name.gen' / 'c.v').write_text('module c; endmodule')
+        (self.project / 'name.runs').mkdir()
+
+        report = self.snapshots.restore('main', self.project, 'key')
+        self.assertEqual(self.files(), before)
+        self.assertTrue((self.project / 'link').is_symlink())
+        self.assertEqual(report.copied, len('<Project/>') + len('module a; endmodule'))
+
+        # Restored files are copies, editing them leaves the snapshot alone.
+        (self.project / 'name.xpr').write_text('<Project edited/>')
+        self.snapshots.restore('main', self.project, 'key')
+        self.assertEqual(self.files(), before)
+
+        with self.assertRaises(ValueError):
+            self.snapshots.restore('main', self.project, 'other')
+        with self.assertRaises(ValueError):
+            self.snapshots.restore('missing', self.project, 'key')
+
+    def test_evict(self):
+        self.snapshots.max_size = 100
+        self.snapshots.save('old', self.project, 'key')
+        os.utime(self.snapshots.folder / 'old', (100, 100))
+        (self.project / 'name.xpr').write_text('<Project>' + 'x' * 80 + '</Project>')
+        self.snapshots.save('new', self.project, 'key')
+
+        self.assertEqual([entry.name for entry, _, _ in self.snapshots.entries()], ['new'])
+        # Only the objects of the evicted snapshot are gone.
+        self.assertEqual(self.snapshots.size(), 99 + len('module a; endmodule'))
+        self.assertTrue(self.snapshots.remove('new'))
+        self.assertEqual(self.snapshots.size(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+
+from vivamir.utility.transfer import BUFFERED, COPY_FILE_RANGE, REFLINK, SENDFILE, _Support, copy_file, transfer
+
+
+class TestTransfer(unittest.TestCase):
+    def setUp(self):
+        self.source = Path(mkdtemp())
+        self.destination = Path(mkdtemp())
+        for index in range(50):
+            file = self.source / f'module_{index % 5}' / f'm{index}.sv'
+            file.parent.mkdir(exist_ok=True)
+            file.write_text(f'module m{index}; endmodule\n' * (index + 1))
+            os.utime(file, ns=(1_000_000_000, 1_000_000_000 + index))
+
+    def pairs(self) -> list[tuple[Path, Path]]:
+        return [(file, self.destination / file.relative_to(self.source)) for file in self.source.rglob('*.sv')]
+
+    def test_transfer(self):
+        report = transfer(self.pairs(), jobs=4)
+        self.assertEqual(sum(report.copied.values()), 50)
+        for source, destination in self.pairs():
+            self.assertEqual(destination.read_bytes(), source.read_bytes())
+            self.assertEqual(destination.stat().st_mtime_ns, source.stat().st_mtime_ns)
+
+        # Same size and time, nothing to copy.
+        report = transfer(self.pairs(), jobs=4)
+        self.assertEqual((report.copied, report.unchanged), ({}, 50))
+
+        source = self.source / 'module_0' / 'm0.sv'
+        source.write_text('module changed; endmodule\n')
+        report = transfer(self.pairs(), jobs=4)
+        self.assertEqual((sum(report.copied.values()), report.unchanged), (1, 49))
+        self.assertEqual((self.destination / 'module_0' / 'm0.sv').read_text(), 'module changed; endmodule\n')
+
+    def test_methods(self):
+        source = self.source / 'module_1' / 'm1.sv'
+        destination = self.destination / 'm1.sv'
+        support = _Support()
+        method, size = copy_file(source, destination, support)
+        self.assertIn(method, [REFLINK, COPY_FILE_RANGE, SENDFILE, BUFFERED])
+        self.assertEqual(size, source.stat().st_size)
+
+        device = source.stat().st_dev
+        for method in [REFLINK, COPY_FILE_RANGE, SENDFILE]:
+            support.unsupported(device, method)
+        self.assertEqual(copy_file(source, destination, support), (BUFFERED, source.stat().st_size))
+        self.assertEqual(destination.read_bytes(), source.read_bytes())
+
+    def test_hard_links(self):
+        source = self.source / 'module_2' / 'm2.sv'
+        destination = self.destination / 'm2.sv'
+        destination.write_text('original\n')
+        os.link(destination, self.destination / 'linked.sv')
+
+        copy_file(source, destination)
+        self.assertEqual(destination.read_bytes(), source.read_bytes())
+        self.assertEqual((self.destination / 'linked.sv').read_text(), 'original\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
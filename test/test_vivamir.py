@@ -1,29 +1,71 @@
+import io
+import subprocess
+import threading
 import unittest
-from vivamir.utility.paths import DEFAULT
 import tomllib
 from tempfile import mkdtemp
 from pathlib import Path
 
-from vivamir.utility.version import SemanticVersion
+from rich.console import Console
+
+from vivamir.commands.workspace import Workspace, _run_project
 from vivamir.vivamir import Vivamir
+from test.helpers import default_config, make_project
 
 
 class TestParsing(unittest.TestCase):
-    class AnyKey:
-        def __getitem__(self, item):
-            if item in ['major', 'minor', 'patch']:
-                return SemanticVersion.project().__getattribute__(item)
-            return item
-
     def test_valid_toml(self):
-        default = (DEFAULT / 'vivamir.pyl').read_text().format_map(self.AnyKey())
-        tomllib.loads(default)
+        tomllib.loads(default_config())
 
     def test_parse(self):
+        Vivamir.load(make_project(Path(mkdtemp()).resolve()))
+
+
+class TestLazy(unittest.TestCase):
+    def test_lazy(self):
+        tmp = Path(mkdtemp()).resolve()
+        (tmp / 'vivamir.toml').write_text(
+            default_config().replace("{ kind = 'design', path = 'src' }", "{ kind = 'design', exec = 'touch ran; false' }"))
+
+        # Nothing is resolved until needed.
+        vivamir = Vivamir.load(tmp)
+        self.assertFalse((tmp / 'ran').exists())
+        self.assertEqual(vivamir.name, 'name')
+
+        with self.assertRaises(FileNotFoundError):
+            _ = vivamir.ignore
+        with self.assertRaises(FileNotFoundError):
+            vivamir.check()
+        (tmp / 'vivamir.ignore').write_text('src/ignored.sv\n')
+        self.assertEqual(vivamir.ignore.list, {Path('src/ignored.sv')})
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            _ = vivamir.filesets
+        with self.assertRaises(subprocess.CalledProcessError):
+            vivamir.check()
+        self.assertTrue((tmp / 'ran').exists())
+
+
+class TestWorkspace(unittest.TestCase):
+    def test_discover(self):
         tmp = Path(mkdtemp()).resolve()
-        (tmp / 'vivamir.toml').write_text((DEFAULT / 'vivamir.pyl').read_text().format_map(self.AnyKey()))
-        (tmp / 'vivamir.ignore').write_text((DEFAULT / 'vivamir.ignore').read_text())
-        Vivamir.load(tmp)
+        for project in ['a', 'b/c', 'b/c/vivamir/d', '.hidden']:
+            (tmp / project).mkdir(parents=True)
+            (tmp / project / 'vivamir.toml').touch()
+
+        self.assertEqual(Vivamir.discover(tmp), [tmp / 'a', tmp / 'b/c'])
+
+    def test_prefix(self):
+        tmp = Path(mkdtemp()).resolve()
+        project = tmp / ('long' * 10)
+        project.mkdir()
+        make_project(project)
+
+        # Long lines are never wrapped, each keeps its prefix.
+        output = io.StringIO()
+        code = _run_project(Workspace(tmp, [project], 1), project, ['root'], Console(file=output, width=20),
+                            threading.Lock())
+        self.assertEqual((code, output.getvalue()), (0, f'[{project.name}] {project}\n'))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,156 @@
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from tempfile import mkdtemp
+from unittest import mock
+
+from vivamir.utility.hdl import Source
+from vivamir.vivamir import Vivamir
+from vivamir.xsim import XsimFlow
+from test.helpers import make_project
+
+# Stands in for xvlog, xvhdl, xelab and xsim, recording each call with the files xvlog reads from its project.
+FAKE_XSIM = f"""#!{sys.executable}
+import json, os, sys
+from pathlib import Path
+
+tool, arguments = Path(sys.argv[0]).name, sys.argv[1:]
+if tool == 'xvlog':
+    arguments += [line.split('"')[1] for line in Path(arguments[arguments.index('--prj') + 1]).read_text().splitlines()]
+with open(os.environ['FAKE_XSIM_CALLS'], 'a') as calls:
+    calls.write(json.dumps([tool, arguments]) + '\\n')
+
+if tool in ('xvlog', 'xvhdl'):
+    Path(arguments[arguments.index('--work') + 1].split('=', 1)[1]).mkdir(parents=True, exist_ok=True)
+    sources = [Path(argument) for argument in arguments if argument.endswith(('.v', '.sv', '.svh', '.vhd'))]
+    sys.exit(1 if any('syntax error' in source.read_text() for source in sources) else 0)
+if tool == 'xelab':
+    Path('xsim.dir', arguments[arguments.index('--snapshot') + 1]).mkdir(parents=True, exist_ok=True)
+if tool == 'xsim':
+    print('$finish called')
+"""
+
+
+# What xvlog compiles into the design library.
+DESIGN = ['defs.svh', 'pkg.sv', 'a.sv', 'b.v']
+
+
+class TestXsimFlow(unittest.TestCase):
+    def setUp(self):
+        self.root = make_project(Path(mkdtemp()).resolve(), ignore='', simulation_top='tb')
+        for folder in ['src', 'test', 'include']:
+            (self.root / folder).mkdir()
+        (self.root / 'include' / 'defs.svh').write_text('`define WIDTH 8\n')
+        (self.root / 'src' / 'pkg.sv').write_text('package pkg;\n  typedef logic [7:0] byte_t;\nendpackage\n')
+        (self.root / 'src' / 'a.sv').write_text('`include "defs.svh"\nmodule a(input pkg::byte_t x);\nendmodule\n')
+        (self.root / 'src' / 'b.v').write_text('module b; // not pkg::byte_t\nendmodule\n')
+        (self.root / 'test' / 'tb.sv').write_text('module tb;\n  a a();\n  b b();\nendmodule\n')
+
+        bin = Path(mkdtemp())
+        for tool in ['xvlog', 'xvhdl', 'xelab', 'xsim']:
+            (bin / tool).write_text(FAKE_XSIM)
+            (bin / tool).chmod(0o755)
+        self.vivado = [str(bin / 'vivado')]
+        self.calls = bin / 'calls'
+        environment = mock.patch.dict(os.environ, {'FAKE_XSIM_CALLS': str(self.calls)})
+        environment.start()
+        self.addCleanup(environment.stop)
+
+    def run_flow(self) -> tuple[int, list[tuple[str, list[str]]]]:
+        """ Runs the flow, returning its exit code and the tools called, with the sources each xvlog compiled. """
+
+        self.calls.unlink(missing_ok=True)
+        code, _ = XsimFlow(Vivamir.load(self.root), self.vivado, jobs=4).run()
+        calls = [json.loads(line) for line in self.calls.read_text().splitlines()] if self.calls.exists() else []
+        return code, [(tool, [Path(argument).name for argument in arguments
+                              if argument.endswith(('.v', '.sv', '.svh'))] if tool == 'xvlog' else [])
+                      for tool, arguments in calls]
+
+    def test_incremental(self):
+        code, calls = self.run_flow()
+        self.assertEqual(code, 0)
+        # One call per library, the global includes first and packages before what uses them.
+        self.assertEqual(sorted(files for tool, files in calls if tool == 'xvlog'),
+                         [DESIGN, ['defs.svh', 'tb.sv']])
+        self.assertEqual([tool for tool, _ in calls[-2:]], ['xelab', 'xsim'])
+
+        # Nothing changed, only the simulation runs.
+        self.assertEqual(self.run_flow(), (0, [('xsim', [])]))
+
+        # Only a changed source and what depends on it are compiled again, after the global includes.
+        (self.root / 'src' / 'pkg.sv').write_text('package pkg;\n  typedef logic [15:0] byte_t;\nendpackage\n')
+        self.assertEqual(self.run_flow(), (0, [('xvlog', ['defs.svh', 'pkg.sv', 'a.sv']),
+                                               ('xelab', []), ('xsim', [])]))
+        (self.root / 'test' / 'tb.sv').write_text('module tb;\n  a a();\nendmodule\n')
+        self.assertEqual(self.run_flow(), (0, [('xvlog', ['defs.svh', 'tb.sv']), ('xelab', []), ('xsim', [])]))
+
+        # Global includes are part of every library.
+        (self.root / 'include' / 'defs.svh').write_text('`define WIDTH 16\n')
+        _, calls = self.run_flow()
+        self.assertEqual(sorted(files for tool, files in calls if tool == 'xvlog'), [DESIGN, ['defs.svh', 'tb.sv']])
+
+    def test_macros(self):
+        (self.root / 'src' / 'b.v').write_text('`define DEPTH 4\nmodule b;\nendmodule\n')
+        self.run_flow()
+
+        # Later sources may use the macros of another, so its whole library is compiled again.
+        (self.root / 'src' / 'a.sv').write_text('`include "defs.svh"\nmodule a(input pkg::byte_t y);\nendmodule\n')
+        _, calls = self.run_flow()
+        self.assertEqual([files for tool, files in calls if tool == 'xvlog'], [DESIGN])
+
+    def test_removed(self):
+        self.run_flow()
+
+        # The units of a removed source would linger in the library, so it is compiled from scratch.
+        (self.root / 'src' / 'b.v').unlink()
+        (self.root / 'test' / 'tb.sv').write_text('module tb;\n  a a();\nendmodule\n')
+        _, calls = self.run_flow()
+        self.assertEqual(sorted(files for tool, files in calls if tool == 'xvlog'),
+                         [['defs.svh', 'pkg.sv', 'a.sv'], ['defs.svh', 'tb.sv']])
+
+    def test_simulation_library(self):
+        (self.root / 'test' / 'tb.sv').write_text('module tb;\n  import pkg::*;\n  a a();\nendmodule\n')
+        self.run_flow()
+
+        # The testbench needs the package, so the design library comes first and is searched.
+        (self.root / 'src' / 'pkg.sv').write_text('package pkg;\nendpackage\n')
+        _, calls = self.run_flow()
+        self.assertEqual([files for tool, files in calls if tool == 'xvlog'],
+                         [['defs.svh', 'pkg.sv', 'a.sv'], ['defs.svh', 'tb.sv']])
+        design, simulation = [json.loads(line)[1] for line in self.calls.read_text().splitlines()][:2]
+        self.assertEqual(simulation[simulation.index('-L') + 1], 'xil_defaultlib')
+        self.assertEqual(design[design.index('-i') + 1], str(self.root / 'include'))
+
+    def test_failure(self):
+        (self.root / 'src' / 'pkg.sv').write_text('package pkg; syntax error\nendpackage\n')
+        code, calls = self.run_flow()
+        self.assertEqual(code, 1)
+        self.assertNotIn('xelab', [tool for tool, _ in calls])
+
+        # Nothing of the failed library was recorded, so it is compiled whole again.
+        (self.root / 'src' / 'pkg.sv').write_text('package pkg;\nendpackage\n')
+        code, calls = self.run_flow()
+        self.assertEqual(code, 0)
+        self.assertEqual([files for tool, files in calls if tool == 'xvlog'], [DESIGN])
+
+
+class TestSource(unittest.TestCase):
+    def test_scan(self):
+        path = Path(mkdtemp()) / 'a.sv'
+        source = Source.scan(path, '`include "x.svh"\n/* module hidden; */\npackage p;\nendpackage\n'
+                                   'module m; import q::*; string s = "// not::comment"; endmodule\n')
+        self.assertEqual(source.units, {'p', 'm'})
+        self.assertEqual(source.packages, {'p'})
+        self.assertEqual(source.references, {'q'})
+        self.assertEqual(source.includes, [('x.svh', 1)])
+
+        vhdl = Source.scan(path.with_suffix('.vhdl'), 'library ieee; -- entity hidden is\nuse work.Types.all;\n'
+                                                     'entity Top is end;\npackage body types is end;\n')
+        self.assertEqual(vhdl.units, {'top'})
+        self.assertEqual(vhdl.references, {'types'})
+
+
+if __name__ == '__main__':
+    unittest.main()